@@ -0,0 +1 @@
+# Shared building blocks for the RDash vendor bulk upload scripts.
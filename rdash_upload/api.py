@@ -0,0 +1,266 @@
+# Direct API mode: reads the logged-in session from the attached Chrome once, then
+# replays the vendor-create and KYC/TRN calls the wizard makes through a pooled
+# aiohttp client with bounded concurrency. Vendors the API rejects with a 4xx are handed
+# to the browser flow afterwards, unless --fallback none is given. Vendors created whose
+# KYC call still fails after retries go to the edit flow, so they are not created twice;
+# without a browser they, like creates that timed out or got a 5xx, are reported as
+# needs_check and kept out of --resume.
+#
+#   python -m rdash_upload.api                                   # attach to 127.0.0.1:9211
+#   python -m rdash_upload.stub_server &                         # local stand-in that records requests
+#   python -m rdash_upload.api --base-url http://127.0.0.1:8765 --no-browser --token test
+#
+# Needs aiohttp (pip install aiohttp).
+import argparse
+import asyncio
+import time
+from urllib.parse import urlsplit
+
+from . import journal, reader, report
+from .config import (API_CONCURRENCY, API_KYC_PATH, API_VENDOR_PATH, DEBUGGER_ADDRESS,
+                     EXCEL_FILE_PATH, RETRY_ATTEMPTS, RETRY_BASE_DELAY, WAIT_TIMEOUT)
+
+# localStorage keys the SPA may keep its bearer token under
+_TOKEN_JS = """
+for (var i = 0; i < localStorage.length; i++) {
+  var key = localStorage.key(i);
+  if (!/token/i.test(key)) continue;
+  var value = localStorage.getItem(key);
+  try { var parsed = JSON.parse(value); value = parsed.access_token || parsed.accessToken || parsed.token || value; }
+  catch (e) {}
+  if (typeof value === 'string' && value) return value;
+}
+return null;
+"""
+
+
+class ApiError(Exception):
+    def __init__(self, status, body):
+        super().__init__(f"HTTP {status}: {body[:200]}")
+        self.status = status
+
+    @property
+    def duplicate(self):
+        return self.status == 409
+
+
+class KycError(Exception):
+    """The vendor was created but its KYC/TRN call failed; it must not be created again."""
+
+    def __init__(self, vendor_id, cause):
+        super().__init__(f"vendor {vendor_id} created, KYC failed: {cause}")
+        self.vendor_id = vendor_id
+
+
+class ApiSession:
+    def __init__(self, base_url, token=None, cookies=None):
+        self.base_url = base_url.rstrip("/")
+        self.headers = {"Accept": "application/json"}
+        if token:
+            self.headers["Authorization"] = f"Bearer {token}"
+        self.cookies = cookies or {}
+
+    def url(self, path):
+        return self.base_url + path
+
+
+def session_from_browser(driver, base_url=None):
+    """Take the cookies and bearer token from the attached, logged-in Chrome."""
+    if base_url is None:
+        parts = urlsplit(driver.current_url)
+        base_url = f"{parts.scheme}://{parts.netloc}"
+    cookies = {c["name"]: c["value"] for c in driver.get_cookies()}
+    return ApiSession(base_url, driver.execute_script(_TOKEN_JS), cookies)
+
+
+# same fields the wizard fills in: 'Do not have Trade License Number' + companyName,
+# then TRN on the KYC page
+def vendor_payload(vendor):
+    return {"companyName": vendor.name, "hasTradeLicense": False}
+
+
+def kyc_payload(vendor):
+    return {"TRN": vendor.trn}
+
+
+def _vendor_id(body):
+    if isinstance(body, dict):
+        data = body.get("data", body)
+        for field in ("id", "_id", "vendorId"):
+            if isinstance(data, dict) and data.get(field) is not None:
+                return data[field]
+    raise ApiError(200, f"no vendor id in response: {body!r}")
+
+
+async def _post(http, url, payload):
+    async with http.post(url, json=payload) as resp:
+        text = await resp.text()
+        if resp.status >= 400:
+            raise ApiError(resp.status, text)
+        return await resp.json(content_type=None) if text else {}
+
+
+async def submit_vendor(http, api, vendor):
+    import aiohttp
+
+    body = await _post(http, api.url(API_VENDOR_PATH), vendor_payload(vendor))
+    vendor_id = _vendor_id(body)
+    if not vendor.trn:
+        return vendor_id
+    # the vendor exists from here on: retry only the KYC call, never the create
+    for attempt in range(1, RETRY_ATTEMPTS + 1):
+        try:
+            await _post(http, api.url(API_KYC_PATH.format(vendor_id=vendor_id)), kyc_payload(vendor))
+            return vendor_id
+        except Exception as e:
+            transient = isinstance(e, (aiohttp.ClientError, asyncio.TimeoutError)) or (
+                isinstance(e, ApiError) and e.status >= 500)
+            if not transient or attempt == RETRY_ATTEMPTS:
+                raise KycError(vendor_id, e) from e
+            await asyncio.sleep(RETRY_BASE_DELAY * 2 ** (attempt - 1))
+
+
+async def submit_all(vendors, api, on_result, concurrency=API_CONCURRENCY, checkpoints=None):
+    """Submit every vendor with at most `concurrency` requests in flight.
+
+    on_result(vendor, error, seconds) is called as each vendor finishes; error is None on success.
+    """
+    import aiohttp
+
+    connector = aiohttp.TCPConnector(limit=concurrency, keepalive_timeout=30)
+    timeout = aiohttp.ClientTimeout(total=WAIT_TIMEOUT)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(http, vendor):
+        async with semaphore:
+            started = time.monotonic()
+            try:
+                await submit_vendor(http, api, vendor)
+                error = None
+            except Exception as e:
+                # anything, e.g. a 2xx with a body that is not JSON: the row must still be reported
+                error = e
+            on_result(vendor, error, time.monotonic() - started)
+
+    async with aiohttp.ClientSession(headers=api.headers, cookies=api.cookies,
+                                     connector=connector, timeout=timeout) as http:
+        pending = set()
+        for vendor in vendors:
+            if checkpoints and not checkpoints.claim(vendor, "api"):
+                on_result(vendor, "skipped", 0.0)
+                continue
+            # don't read further ahead than we can submit, so streaming input stays streaming
+            if len(pending) >= concurrency * 2:
+                _, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            pending.add(asyncio.create_task(one(http, vendor)))
+        if pending:
+            await asyncio.wait(pending)
+
+
+def _browser_fallback(driver, vendors, strategy, run_report, checkpoints):
+    from . import flows, pages, runner, session
+
+    wizard = pages.VendorWizard(driver, session.make_wait(driver))
+    flows.prepare(wizard, strategy)
+    remaining = iter(vendors)
+    # the API pass already claimed these rows in the journal
+    runner.process(wizard, remaining, strategy, lambda r: run_report.add(dict(r, worker="browser")),
+                   checkpoints, claim=False)
+    for vendor in remaining:
+        if checkpoints:
+            checkpoints.finish(vendor.key, "not attempted", "session could not recover")
+        run_report.add(dict(vendor.as_dict(), worker="browser", status="not attempted",
+                            error="session could not recover", seconds=0.0))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Create vendors through the RDash API instead of the UI.")
+    parser.add_argument("--file", default=EXCEL_FILE_PATH)
+    parser.add_argument("--debugger-address", default=DEBUGGER_ADDRESS,
+                        help="Chrome to read the logged-in session from")
+    parser.add_argument("--no-browser", action="store_true",
+                        help="don't attach to Chrome (e.g. against the stub server); implies --fallback none")
+    parser.add_argument("--base-url", help="API origin; defaults to the origin of the attached tab")
+    parser.add_argument("--token", help="bearer token to use instead of the browser's")
+    parser.add_argument("--concurrency", type=int, default=API_CONCURRENCY)
+    parser.add_argument("--fallback", choices=["close", "full", "none"], default="close",
+                        help="browser flow for vendors the API rejects")
+    parser.add_argument("--report", default=report.REPORT_PATH)
+    journal.add_arguments(parser)
+    args = parser.parse_args()
+
+    driver = None
+    if args.no_browser:
+        if not args.base_url:
+            parser.error("--base-url is required with --no-browser")
+        api = ApiSession(args.base_url, args.token)
+    else:
+        from . import session
+
+        try:
+            driver = session.attach(args.debugger_address)
+            print("✅ Script Attached to Browser Successfully.")
+        except Exception as e:
+            print("❌ ERROR: Could not attach to Chrome.")
+            print(f"   Error details: {e}")
+            return
+        api = session_from_browser(driver, args.base_url)
+        if args.token:
+            api.headers["Authorization"] = f"Bearer {args.token}"
+    print(f"   > Sending vendors to {api.base_url} ({args.concurrency} at a time)...")
+
+    try:
+        vendors = reader.iter_vendors(args.file)
+    except FileNotFoundError:
+        print(f"❌ ERROR: The file '{args.file}' was not found. Please make sure it's in the same folder.")
+        return
+    if args.journal:
+        vendors = journal.prepare_run(args.journal, vendors, args.resume, args.retry_in_flight)
+    checkpoints = journal.Journal(args.journal) if args.journal else None
+
+    rejected = []
+    kyc_failed = []
+    with report.RunReport(args.report) as run_report:
+        def finish(vendor, status, error, seconds):
+            if checkpoints:
+                checkpoints.finish(vendor.key, status, error)
+            run_report.add(dict(vendor.as_dict(), worker="api", status=status, error=error, seconds=seconds))
+
+        def on_result(vendor, error, seconds):
+            fallback = driver is not None and args.fallback != "none"
+            if error == "skipped":
+                run_report.add(dict(vendor.as_dict(), worker="api", status="skipped", error="", seconds=0.0))
+            elif error is None or (isinstance(error, ApiError) and error.duplicate):
+                finish(vendor, "success" if error is None else "duplicate", "" if error is None else str(error), seconds)
+            elif isinstance(error, KycError):
+                # a vendor created without its TRN is finished by the edit flow, never created again
+                if fallback:
+                    kyc_failed.append(vendor)
+                else:
+                    finish(vendor, "needs_check", str(error), seconds)
+            elif isinstance(error, ApiError) and 400 <= error.status < 500:
+                # a definite rejection: nothing was created, so the browser may create it
+                if fallback:
+                    rejected.append(vendor)
+                else:
+                    finish(vendor, "failed", str(error), seconds)
+            else:
+                # timed out, connection dropped, 5xx or no vendor id: the create may have gone through
+                finish(vendor, "needs_check", f"create call failed, vendor may exist: {error}", seconds)
+
+        asyncio.run(submit_all(vendors, api, on_result, args.concurrency, checkpoints))
+        if rejected:
+            print(f"\n--- {len(rejected)} vendors were rejected by the API. Retrying them in the browser... ---")
+            _browser_fallback(driver, rejected, args.fallback, run_report, checkpoints)
+        if kyc_failed:
+            print(f"\n--- {len(kyc_failed)} vendors were created without their TRN. Adding it in the browser... ---")
+            _browser_fallback(driver, kyc_failed, "edit", run_report, checkpoints)
+    if checkpoints:
+        checkpoints.close()
+    run_report.print_summary()
+    if driver is not None:
+        driver.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+# Offline benchmark of the four flow strategies. Starts the stub server (which serves
+# mock_wizard.html) with the given latency, runs each strategy in a headless Chrome
+# over the same number of synthetic vendors and reports vendors/min and per-step
+# latency from the step traces.
+#
+#   python -m rdash_upload.bench_flows --vendors 50 --latency 0.15
+#   python -m rdash_upload.bench_flows --strategies close full --vendors 200
+import argparse
+
+from . import flows, pages, recovery, runner, session, stub_server, trace, waits
+from .config import KNOWN_TAGS
+from .reader import Vendor
+
+
+def synthetic_vendors(strategy, count):
+    for i in range(count):
+        # every other vendor has a TRN so both KYC branches are exercised
+        trn = f"100{i:012d}" if i % 2 == 0 else None
+        yield Vendor(i, f"BENCH {strategy.upper()} VENDOR {i:05d} LLC", trn, KNOWN_TAGS[i % len(KNOWN_TAGS)])
+
+
+def bench_strategy(strategy, url, count, trace_path, fast_fill=False):
+    waits.STATS = waits.WaitStats()
+    recovery.STATS = recovery.RecoveryStats()
+    driver = session.launch_headless(url)
+    tracer = trace.Tracer(trace_path)
+    wizard = pages.VendorWizard(driver, session.make_wait(driver), log=lambda msg: None, tracer=tracer,
+                                fast_fill=fast_fill)
+    results = []
+    try:
+        flows.prepare(wizard, strategy)
+        runner.process(wizard, synthetic_vendors(strategy, count), strategy, results.append)
+    finally:
+        tracer.close()
+        driver.quit()
+    summary = trace.summarize([trace_path])
+    summary["failed"] = sum(r["status"] != "success" for r in results)
+    summary["saved"] = waits.STATS.saved
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the flow strategies against the local mock wizard.")
+    parser.add_argument("--strategies", nargs="+", choices=sorted(flows.FLOWS), default=["back", "reopen", "close", "full"])
+    parser.add_argument("--vendors", type=int, default=25)
+    parser.add_argument("--latency", type=float, default=0.15, help="seconds the stub adds to every API call")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--trace-prefix", default="bench_trace")
+    parser.add_argument("--fast-fill", action="store_true", help="use the injected-script form filling")
+    args = parser.parse_args()
+
+    server = stub_server.serve(args.port, args.latency)
+    url = f"http://127.0.0.1:{args.port}/"
+    print(f"✅ Mock wizard at {url} with {args.latency * 1000:.0f} ms latency, {args.vendors} vendors per strategy.")
+
+    summaries = {}
+    try:
+        for strategy in args.strategies:
+            print(f"\n--- Benchmarking '{strategy}' ---")
+            trace_path = f"{args.trace_prefix}.{strategy}.jsonl"
+            summaries[strategy] = summary = bench_strategy(strategy, url, args.vendors, trace_path, args.fast_fill)
+            trace.print_summary(summary)
+    finally:
+        server.shutdown()
+
+    print(f"\n{'strategy':<10}{'vendors/min':>13}{'failed':>8}{'wait s':>9}{'act s':>9}{'sleep saved s':>15}")
+    for strategy, s in summaries.items():
+        print(f"{strategy:<10}{s['vendors_per_minute']:>13.1f}{s['failed']:>8}{s['wait_seconds']:>9.1f}"
+              f"{s['act_seconds']:>9.1f}{s['saved']:>15.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+# Micro-benchmark of locator resolution: times find_elements for each locator in
+# locators.py against the text XPath the original scripts used, on whatever page the
+# browser is showing. Open the vendor side panel first to cover the footer buttons.
+#
+#   python -m rdash_upload.bench_locators                  # attached Chrome on 127.0.0.1:9211
+#   python -m rdash_upload.bench_locators --url file:///.../page.html --headless
+import argparse
+import statistics
+import time
+
+from . import locators as L
+from . import pages, session
+from .config import DEBUGGER_ADDRESS
+
+
+def _time(find, repeat):
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        find()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples), len(find())
+
+
+def bench(driver, repeat=50):
+    wizard = pages.VendorWizard(driver, session.make_wait(driver, 0))
+    rows = []
+    for name, legacy in L.LEGACY.items():
+        current = getattr(L, name)
+        old_ms, old_found = _time(lambda: driver.find_elements(*legacy), repeat)
+        if current[1].startswith("."):
+            # relative locator: resolved inside the cached footer
+            def find():
+                try:
+                    return wizard.container(L.FOOTER).find_elements(*current)
+                except Exception:
+                    return []
+        else:
+            def find():
+                return driver.find_elements(*current)
+        new_ms, new_found = _time(find, repeat)
+        rows.append((name, old_ms, new_ms, old_found, new_found))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare locator resolution time, old vs new.")
+    parser.add_argument("--debugger-address", default=DEBUGGER_ADDRESS)
+    parser.add_argument("--url", help="page to load first")
+    parser.add_argument("--headless", action="store_true", help="launch a headless Chrome instead of attaching")
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    driver = session.launch_headless(args.url) if args.headless else session.attach(args.debugger_address)
+    if args.url and not args.headless:
+        driver.get(args.url)
+    try:
+        rows = bench(driver, args.repeat)
+    finally:
+        if args.headless:
+            driver.quit()
+
+    print(f"{'locator':<20}{'old ms':>10}{'new ms':>10}{'speedup':>10}   found old/new")
+    for name, old_ms, new_ms, old_found, new_found in rows:
+        print(f"{name:<20}{old_ms:>10.2f}{new_ms:>10.2f}{old_ms / max(new_ms, 1e-6):>9.1f}x   {old_found}/{new_found}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,438 @@
+# Asyncio Chrome DevTools Protocol transport. Talks to the attached Chrome over one
+# websocket, with no chromedriver in between, and runs the vendor wizard in several
+# tabs of that browser concurrently under one event loop. Waits are MutationObserver
+# promises evaluated in the page (Runtime.evaluate with awaitPromise), so they resolve
+# on the DOM change itself instead of polling on an interval.
+#
+# The step sequences are those of vendor4.py ('close') and rdashvendor.py ('full').
+#
+#   python -m rdash_upload.cdp --tabs 4 --url https://.../manage-vendor
+#
+# Needs websockets (pip install websockets).
+import argparse
+import asyncio
+import itertools
+import json
+import time
+import urllib.request
+
+from . import journal, reader, report
+from . import locators as L
+from .config import DEBUGGER_ADDRESS, EXCEL_FILE_PATH, WAIT_TIMEOUT
+
+# locate() (locators.LOCATE_JS) resolves the locators.py tuples inside the page
+_HELPERS_JS = L.LOCATE_JS + """
+var visible = function (el) {
+  if (!el) return false;
+  var style = getComputedStyle(el), box = el.getBoundingClientRect();
+  return style.visibility !== 'hidden' && style.display !== 'none' && box.width > 0 && box.height > 0;
+};
+"""
+
+_WAIT_JS = """
+function (loc, state, timeoutMs) {
+  function ready() {
+    var el = locate(loc);
+    if (state === 'present') return !!el;
+    if (state === 'hidden') return !visible(el);
+    return visible(el) && (state !== 'clickable' || !el.disabled);
+  }
+  return new Promise(function (resolve, reject) {
+    if (ready()) return resolve(true);
+    var observer = new MutationObserver(function () {
+      if (ready()) { observer.disconnect(); clearTimeout(timer); resolve(true); }
+    });
+    observer.observe(document, {subtree: true, childList: true, attributes: true, characterData: true});
+    var timer = setTimeout(function () {
+      observer.disconnect();
+      reject(new Error('timed out waiting for ' + state + ' ' + loc[1]));
+    }, timeoutMs);
+  });
+}
+"""
+
+_CLICK_JS = """
+function (loc) {
+  var el = locate(loc);
+  if (!el) throw new Error('no element for ' + loc[1]);
+  el.scrollIntoView({block: 'center'});
+  el.click();
+  return true;
+}
+"""
+
+# where to press the mouse: the element's centre once it is scrolled into view
+_CENTRE_JS = """
+function (loc) {
+  var el = locate(loc);
+  if (!el) throw new Error('no element for ' + loc[1]);
+  el.scrollIntoView({block: 'center'});
+  var box = el.getBoundingClientRect();
+  return {x: box.left + box.width / 2, y: box.top + box.height / 2};
+}
+"""
+
+_FOCUS_JS = """
+function (loc, clear) {
+  var el = locate(loc);
+  if (!el) throw new Error('no element for ' + loc[1]);
+  el.focus();
+  if (clear) el.select();
+  return true;
+}
+"""
+
+
+class CDPError(Exception):
+    pass
+
+
+def browser_ws_url(debugger_address):
+    with urllib.request.urlopen(f"http://{debugger_address}/json/version", timeout=10) as resp:
+        return json.load(resp)["webSocketDebuggerUrl"]
+
+
+class Browser:
+    """One websocket to the browser; tabs talk through it with flattened sessions."""
+
+    def __init__(self, ws):
+        self.ws = ws
+        self._ids = itertools.count(1)
+        self._pending = {}
+        self._listeners = {}
+        self._reader = asyncio.ensure_future(self._read())
+
+    @classmethod
+    async def connect(cls, debugger_address):
+        import websockets
+
+        url = await asyncio.get_running_loop().run_in_executor(None, browser_ws_url, debugger_address)
+        return cls(await websockets.connect(url, max_size=None))
+
+    async def _read(self):
+        try:
+            async for raw in self.ws:
+                message = json.loads(raw)
+                if "id" in message:
+                    future = self._pending.pop(message["id"], None)
+                    if future and not future.done():
+                        if "error" in message:
+                            future.set_exception(CDPError(message["error"].get("message")))
+                        else:
+                            future.set_result(message.get("result", {}))
+                else:
+                    for queue in self._listeners.get((message.get("sessionId"), message["method"]), ()):
+                        queue.put_nowait(message.get("params", {}))
+        finally:
+            # closed cleanly or not, nobody may be left waiting for a reply
+            for future in self._pending.values():
+                if not future.done():
+                    future.set_exception(CDPError("browser connection closed"))
+            self._pending.clear()
+
+    async def send(self, method, params=None, session_id=None):
+        message = {"id": next(self._ids), "method": method, "params": params or {}}
+        if session_id:
+            message["sessionId"] = session_id
+        future = asyncio.get_running_loop().create_future()
+        self._pending[message["id"]] = future
+        await self.ws.send(json.dumps(message))
+        return await future
+
+    def listen(self, session_id, method):
+        queue = asyncio.Queue()
+        self._listeners.setdefault((session_id, method), []).append(queue)
+        return queue
+
+    def unlisten(self, session_id, method, queue):
+        self._listeners.get((session_id, method), []).remove(queue)
+
+    async def new_tab(self, url):
+        target = await self.send("Target.createTarget", {"url": "about:blank", "background": True})
+        attached = await self.send("Target.attachToTarget", {"targetId": target["targetId"], "flatten": True})
+        tab = Tab(self, target["targetId"], attached["sessionId"])
+        await tab.send("Page.enable")
+        await tab.send("Runtime.enable")
+        # background tabs would otherwise lose focus-dependent behaviour
+        await tab.send("Emulation.setFocusEmulationEnabled", {"enabled": True})
+        await tab.navigate(url)
+        return tab
+
+    async def close(self):
+        self._reader.cancel()
+        await self.ws.close()
+
+
+class Tab:
+    """The VendorWizard page actions, as coroutines over one CDP session."""
+
+    def __init__(self, browser, target_id, session_id, timeout=WAIT_TIMEOUT):
+        self.browser = browser
+        self.target_id = target_id
+        self.session_id = session_id
+        self.timeout = timeout
+        # set once the current vendor's basic details were submitted: the vendor may exist
+        self.submitted = False
+
+    async def send(self, method, params=None):
+        return await self.browser.send(method, params, self.session_id)
+
+    async def evaluate(self, function_js, *args):
+        expression = (f"(function () {{ {_HELPERS_JS} return ({function_js}); }})()"
+                      f"({', '.join(json.dumps(a) for a in args)})")
+        result = await self.send("Runtime.evaluate", {"expression": expression, "awaitPromise": True,
+                                                      "returnByValue": True, "userGesture": True})
+        if "exceptionDetails" in result:
+            details = result["exceptionDetails"]
+            raise CDPError(details.get("exception", {}).get("description") or details.get("text"))
+        return result["result"].get("value")
+
+    async def navigate(self, url=None):
+        loaded = self.browser.listen(self.session_id, "Page.loadEventFired")
+        try:
+            if url:
+                await self.send("Page.navigate", {"url": url})
+            else:
+                await self.send("Page.reload")
+            await asyncio.wait_for(loaded.get(), self.timeout)
+        finally:
+            self.browser.unlisten(self.session_id, "Page.loadEventFired", loaded)
+
+    async def wait_for(self, locator, state="visible", within=None):
+        await self.evaluate(_WAIT_JS, L.js_locator(locator, within), state, int(self.timeout * 1000))
+
+    async def press(self, locator, within=None):
+        """Press and release the left mouse button at the element's centre, the same input
+        Selenium sends. MUI selects open on mousedown, which HTMLElement.click() never fires."""
+        point = await self.evaluate(_CENTRE_JS, L.js_locator(locator, within))
+        await self.send("Input.dispatchMouseEvent", dict(point, type="mouseMoved"))
+        for kind in ("mousePressed", "mouseReleased"):
+            await self.send("Input.dispatchMouseEvent", dict(point, type=kind, button="left", clickCount=1))
+
+    async def click(self, locator, within=None):
+        await self.wait_for(locator, "clickable", within)
+        await self.press(locator, within)
+
+    async def type(self, locator, text, clear=False):
+        await self.wait_for(locator, "visible")
+        await self.evaluate(_FOCUS_JS, L.js_locator(locator), clear)
+        # one native text insertion instead of a key event per character
+        await self.send("Input.insertText", {"text": str(text)})
+
+    # -- wizard pages, same names as pages.VendorWizard ---------------------
+
+    async def open_form(self):
+        await self.click(L.ADD_NEW_VENDOR)
+
+    async def no_trade_license(self):
+        await self.click(L.NO_TRADE_LICENSE)
+
+    async def enter_company_name(self, vendor_name):
+        await self.type(L.COMPANY_NAME, vendor_name)
+
+    async def add_and_continue(self):
+        # the click may land even if waiting for the next page then fails
+        self.submitted = True
+        await self.click(L.ADD_CONTINUE)
+
+    async def wait_for_kyc(self):
+        await self.wait_for(L.KYC_HEADER)
+
+    async def enter_trn(self, trn):
+        await self.type(L.TRN_INPUT, trn)
+
+    async def kyc_continue(self):
+        await self.click(L.ADD_CONTINUE_TEXT, within=L.FOOTER)
+
+    async def skip(self):
+        await self.click(L.SKIP, within=L.FOOTER)
+
+    async def wait_for_bank_details(self):
+        await self.wait_for(L.BANK_HEADER)
+
+    async def skip_bank_details(self):
+        await self.wait_for(L.SKIP, "present", within=L.FOOTER)
+        await self.evaluate(_CLICK_JS, L.js_locator(L.SKIP, L.FOOTER))
+
+    async def skip_user_details(self):
+        await self.click(L.SKIP_TITLE, within=L.FOOTER)
+
+    async def select_tag(self, vendor_tag):
+        await self.click(L.TAGS_DROPDOWN)
+        await self.click(L.tag_option(vendor_tag))
+        await self.press(L.BODY)
+        await self.wait_for(L.OPEN_DROPDOWN, "hidden")
+
+    async def final_add(self):
+        await self.click(L.FINAL_ADD)
+
+    async def close_panel(self):
+        await self.click(L.CLOSE_X)
+
+    async def wait_closed(self):
+        await self.wait_for(L.BACKDROP, "hidden")
+
+    async def cancel(self):
+        try:
+            await self.evaluate(_CLICK_JS, L.js_locator(L.CANCEL))
+        except CDPError:
+            await self.evaluate(_CLICK_JS, L.js_locator(L.CANCEL_OR_CLOSE))
+        await self.wait_closed()
+
+    async def close(self):
+        await self.browser.send("Target.closeTarget", {"targetId": self.target_id})
+
+
+async def _basic_details_and_kyc(tab, vendor):
+    await tab.open_form()
+    await tab.no_trade_license()
+    await tab.enter_company_name(vendor.name)
+    await tab.add_and_continue()
+    await tab.wait_for_kyc()
+    if vendor.trn:
+        await tab.enter_trn(vendor.trn)
+        await tab.kyc_continue()
+        return True
+    await tab.skip()
+    return False
+
+
+async def run_close(tab, vendor):
+    await _basic_details_and_kyc(tab, vendor)
+    await tab.wait_for_bank_details()
+    await tab.close_panel()
+    await tab.wait_closed()
+
+
+async def run_full(tab, vendor):
+    await _basic_details_and_kyc(tab, vendor)
+    await tab.wait_for_bank_details()
+    await tab.skip_bank_details()
+    await tab.skip()
+    await tab.skip_user_details()
+    await tab.select_tag(vendor.tag)
+    await tab.final_add()
+    await tab.wait_closed()
+    await tab.wait_for(L.ADD_NEW_VENDOR, "clickable")
+
+
+FLOWS = {"close": run_close, "full": run_full}
+
+
+async def _clean_up(name, tab):
+    """After a failed vendor: check for the duplicate message, then close the panel or
+    reload the tab. Returns (duplicate, usable); nothing in here may raise."""
+    duplicate = False
+    try:
+        duplicate = bool(await tab.evaluate("function (loc) { return !!locate(loc); }",
+                                            L.js_locator(L.DUPLICATE_MESSAGE)))
+    except Exception:
+        pass
+    try:
+        await tab.cancel()
+        return duplicate, True
+    except Exception:
+        print(f"[{name}]    > Could not find a cancel button. Reloading the tab.", flush=True)
+    try:
+        await tab.navigate()
+        return duplicate, True
+    except Exception as e:
+        print(f"[{name}]    > The tab could not be reloaded ({str(e).strip() or type(e).__name__}). "
+              f"Closing it; the other tabs carry on.", flush=True)
+        return duplicate, False
+
+
+async def _tab_worker(name, tab, queue, strategy, on_result, checkpoints):
+    run = FLOWS[strategy]
+    while True:
+        vendor = await queue.get()
+        if vendor is None:
+            return
+        if checkpoints and not checkpoints.claim(vendor, name):
+            on_result(dict(vendor.as_dict(), worker=name, status="skipped", error="", seconds=0.0))
+            continue
+        print(f"[{name}] --- Processing Vendor: {vendor.name} ---", flush=True)
+        started = time.monotonic()
+        usable = True
+        tab.submitted = False
+        try:
+            await run(tab, vendor)
+            status, error = "success", ""
+            print(f"[{name}] --- ✅ SUCCESS: Vendor '{vendor.name}' added. ---", flush=True)
+        except Exception as e:
+            # anything, including a dropped browser connection: the vendor is still reported
+            status, error = "failed", str(e).strip() or type(e).__name__
+            print(f"[{name}]    >>> ❌ ERROR processing '{vendor.name}'. Skipping. <<<\n[{name}]    Reason: {error}", flush=True)
+            duplicate, usable = await _clean_up(name, tab)
+            if duplicate:
+                status = "duplicate"
+            elif tab.submitted:
+                # as in runner.process: the vendor may exist, so --resume must not create it again
+                status, error = "needs_check", f"failed after submitting, vendor may exist: {error}"
+        if checkpoints:
+            checkpoints.finish(vendor.key, status, error)
+        on_result(dict(vendor.as_dict(), worker=name, status=status, error=error, seconds=time.monotonic() - started))
+        if not usable:
+            return
+
+
+async def _feed(vendors, queue, workers):
+    for vendor in vendors:
+        await queue.put(vendor)
+    for _ in range(workers):
+        await queue.put(None)
+
+
+async def run(vendors, debugger_address, url, tabs, strategy, on_result, checkpoints=None):
+    browser = await Browser.connect(debugger_address)
+    try:
+        opened = await asyncio.gather(*(browser.new_tab(url) for _ in range(tabs)))
+        print(f"✅ Opened {len(opened)} tabs on {url}.")
+        queue = asyncio.Queue(maxsize=tabs * 2)
+        workers = [asyncio.ensure_future(_tab_worker(f"tab{i}", tab, queue, strategy, on_result, checkpoints))
+                   for i, tab in enumerate(opened)]
+        feeder = asyncio.ensure_future(_feed(vendors, queue, len(workers)))
+        # the feeder only runs as long as some tab is left to take vendors
+        await asyncio.wait(workers)
+        if not feeder.done():
+            feeder.cancel()
+            print("   > Stopping: every tab has closed. The vendors not yet started stay pending for --resume.")
+        for tab in opened:
+            try:
+                await tab.close()
+            except Exception:
+                pass  # the tab or the connection is already gone
+    finally:
+        await browser.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Upload vendors over CDP in several tabs of one browser.")
+    parser.add_argument("--file", default=EXCEL_FILE_PATH)
+    parser.add_argument("--debugger-address", default=DEBUGGER_ADDRESS)
+    parser.add_argument("--url", required=True, help="the 'Manage Vendor' page each tab opens")
+    parser.add_argument("--tabs", type=int, default=4)
+    parser.add_argument("--strategy", choices=sorted(FLOWS), default="close")
+    parser.add_argument("--report", default=report.REPORT_PATH)
+    journal.add_arguments(parser)
+    args = parser.parse_args()
+
+    try:
+        vendors = reader.iter_vendors(args.file)
+    except FileNotFoundError:
+        print(f"❌ ERROR: The file '{args.file}' was not found. Please make sure it's in the same folder.")
+        return
+    if args.journal:
+        vendors = journal.prepare_run(args.journal, vendors, args.resume, args.retry_in_flight)
+    checkpoints = journal.Journal(args.journal) if args.journal else None
+
+    with report.RunReport(args.report) as run_report:
+        asyncio.run(run(vendors, args.debugger_address, args.url, args.tabs, args.strategy,
+                        run_report.add, checkpoints))
+    if checkpoints:
+        checkpoints.close()
+    run_report.print_summary()
+
+
+if __name__ == "__main__":
+    main()
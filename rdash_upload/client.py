@@ -0,0 +1,94 @@
+# Client for the upload daemon. Standard library only, so it starts instantly: it does
+# not touch pandas, openpyxl or Selenium, it just hands a file to the daemon.
+#
+#   python -m rdash_upload.client submit Vendors.xlsx --wait
+#   python -m rdash_upload.client status [JOB]
+import argparse
+import json
+import os
+import socket
+import sys
+import time
+
+from .config import DAEMON_PORT
+
+
+def request(payload, port=DAEMON_PORT, timeout=10):
+    with socket.create_connection(("127.0.0.1", port), timeout=timeout) as conn:
+        conn.sendall(json.dumps(payload).encode() + b"\n")
+        reply = b""
+        while not reply.endswith(b"\n"):
+            chunk = conn.recv(65536)
+            if not chunk:
+                break
+            reply += chunk
+    return json.loads(reply)
+
+
+def submit(path, port=DAEMON_PORT):
+    return request({"command": "submit", "path": os.path.abspath(path)}, port)
+
+
+def status(job_id=None, port=DAEMON_PORT):
+    return request({"command": "status", "job": job_id}, port)
+
+
+def wait(job_id, port=DAEMON_PORT, poll=2.0):
+    while True:
+        reply = status(job_id, port)
+        if not reply["ok"] or reply["job"]["state"] in ("done", "failed"):
+            return reply
+        time.sleep(poll)
+
+
+def _describe(job):
+    counts = ", ".join(f"{status}: {count}" for status, count in job["counts"].items())
+    line = f"{job['id']}  {job['state']:<8} {os.path.basename(job['path'])}"
+    if counts:
+        line += f"  ({counts})"
+    if job["error"]:
+        line += f"  error: {job['error']}"
+    return line
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Send vendor files to the upload daemon.")
+    parser.add_argument("--port", type=int, default=DAEMON_PORT)
+    commands = parser.add_subparsers(dest="command", required=True)
+    submit_parser = commands.add_parser("submit", help="queue a vendor file")
+    submit_parser.add_argument("files", nargs="+")
+    submit_parser.add_argument("--wait", action="store_true", help="block until the jobs finish")
+    status_parser = commands.add_parser("status", help="show one job, or all of them")
+    status_parser.add_argument("job", nargs="?")
+    args = parser.parse_args()
+
+    try:
+        if args.command == "submit":
+            queued = []
+            for path in args.files:
+                reply = submit(path, args.port)
+                if not reply["ok"]:
+                    print(f"❌ {path}: {reply['error']}")
+                    continue
+                queued.append(reply["job"])
+                print(f"📥 {reply['job']['id']}  queued  {path}")
+            for job in queued if args.wait else ():
+                reply = wait(job["id"], args.port)
+                print(_describe(reply["job"]) + f"\n   Report: {reply['job']['report']}")
+        else:
+            reply = status(args.job, args.port)
+            if not reply["ok"]:
+                print(f"❌ {reply['error']}")
+                return 1
+            for job in [reply["job"]] if args.job else reply["jobs"]:
+                print(_describe(job))
+            if not args.job:
+                print(f"{reply['queued']} waiting.")
+    except ConnectionRefusedError:
+        print(f"❌ ERROR: No upload daemon on port {args.port}. Start it with 'python -m rdash_upload.daemon'.")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
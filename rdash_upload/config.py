@@ -0,0 +1,62 @@
+import os
+import sys
+
+# to where you saved your chromedriver.exe file. Can be overridden with RDASH_CHROME_DRIVER.
+# Elsewhere than Windows the default is None: Selenium finds (or fetches) a matching driver.
+CHROME_DRIVER_PATH = os.environ.get(
+    "RDASH_CHROME_DRIVER",
+    "C:/Users/rando/Desktop/codes/Projects/Vendor Bulk Upload/chromedriver-win64/chromedriver.exe"
+    if sys.platform == "win32" else None,
+)
+EXCEL_FILE_PATH = "Vendors.xlsx"
+DEBUGGER_ADDRESS = "127.0.0.1:9211"
+WAIT_TIMEOUT = 25  # seconds WebDriverWait waits for elements to appear
+WAIT_CEILING = float(os.environ.get("RDASH_WAIT_CEILING", 10))  # max seconds an adaptive wait may take
+
+# Direct API mode. The paths are what the vendor wizard calls; check them in the
+# browser's Network tab if RDash changes and override them here or via the environment.
+API_VENDOR_PATH = os.environ.get("RDASH_API_VENDOR_PATH", "/api/vendors")
+API_KYC_PATH = os.environ.get("RDASH_API_KYC_PATH", "/api/vendors/{vendor_id}/kyc")
+API_CONCURRENCY = int(os.environ.get("RDASH_API_CONCURRENCY", 8))
+
+# Vendor tags configured in RDash. Rows with any other VendorTag are rejected by the
+# pre-flight check; pass --tags to rdash_upload.preflight to use a different list.
+KNOWN_TAGS = ["HARDWARE", "FABRICATION", "APPLIANCES", "PRESSING", "LAMINATES"]
+
+# Retry queue for transient failures (stale elements, timeouts, lost sessions)
+RETRY_ATTEMPTS = 3        # attempts per vendor, including the first one
+RETRY_BASE_DELAY = 2.0    # seconds before the first retry, doubled for each further one
+
+# Upload daemon (python -m rdash_upload.daemon) and its client
+DAEMON_PORT = int(os.environ.get("RDASH_DAEMON_PORT", 9321))  # localhost only
+DROP_DIR = "drop"          # files dropped here are picked up as jobs
+JOBS_DIR = "jobs"          # one report CSV per job
+DROP_POLL = 2.0            # seconds between drop folder scans
+
+# Self-launched headless Chrome (parallel.py --headless, pool.py)
+CHROME_BINARY = os.environ.get("RDASH_CHROME_BINARY")  # None: the Chrome/Chromium Selenium finds
+STATE_PATH = "rdash_state.json"  # cookies + localStorage exported from a logged-in browser
+# Network.setBlockedURLs patterns: images, web fonts and analytics the wizard never needs.
+# The MUI icons are inline SVG, so they are unaffected.
+BLOCKED_URLS = [
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.ico",
+    "*.woff", "*.woff2", "*.ttf", "*.otf", "*fonts.googleapis.com*", "*fonts.gstatic.com*",
+    "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*", "*hotjar.com*",
+    "*clarity.ms*", "*segment.io*", "*mixpanel.com*", "*facebook.net*",
+]
+
+# Browser health (health.py): sampled every HEALTH_EVERY vendors; crossing any limit
+# recycles the tab/session at the next gap between vendors
+HEALTH_EVERY = 25
+HEAP_LIMIT_MB = 400           # JSHeapUsedSize
+NODES_LIMIT = 60000           # live DOM nodes (leaked MUI modals pile up here)
+LISTENERS_LIMIT = 30000       # JS event listeners
+LATENCY_FACTOR = 2.0          # recent median vendor time vs the median right after the last recycle
+RECYCLE_BUDGET = 500          # vendors per tab/session regardless of the metrics; 0 for no budget
+
+# Adaptive scheduler (parallel.py --adaptive / --max-per-minute)
+MAX_CREATES_PER_MINUTE = 0    # token bucket cap on vendors started per minute; 0 for no cap
+TARGET_SUBMIT_SECONDS = 3.0   # p50 of the 'Add & Continue' / submit steps above which sessions are cut
+MAX_ERROR_RATE = 0.1          # failed share of a window above which sessions are cut
+AIMD_WINDOW = 10              # vendors per scheduling decision
+AIMD_DECREASE = 0.5           # sessions are multiplied by this on overload, and grow by one otherwise
@@ -0,0 +1,256 @@
+# Upload daemon. Attaches to Chrome and initializes the vendor form once, then sits on
+# it and runs batches as they arrive, so a small batch pays only for its own vendors
+# and not for imports, chromedriver, attaching and the '+ Add New Vendor' setup.
+#
+# Jobs come from two places:
+#   - files dropped into the drop folder (moved to drop/processing, then drop/done
+#     or drop/failed when the job ends)
+#   - the local socket, one JSON request per line; see client.py
+#
+# Each job writes its own report to jobs/<job id>.csv.
+#
+#   python -m rdash_upload.daemon --strategy close
+import argparse
+import itertools
+import json
+import os
+import queue
+import shutil
+import socketserver
+import threading
+import time
+
+from . import flows, health, journal, pages, reader, recovery, report, runner, session
+from .config import DAEMON_PORT, DEBUGGER_ADDRESS, DROP_DIR, DROP_POLL, JOBS_DIR
+
+SUFFIXES = (".xlsx", ".csv", ".parquet")
+KEEPALIVE = 60  # seconds idle before checking the browser is still there
+
+
+class Jobs:
+    """Job table shared by the socket server, the drop folder watcher and the worker."""
+
+    def __init__(self, jobs_dir):
+        self.jobs_dir = jobs_dir
+        self.pending = queue.Queue()
+        self._lock = threading.Lock()
+        self._jobs = {}
+        self._ids = itertools.count(1)
+        os.makedirs(jobs_dir, exist_ok=True)
+
+    def submit(self, path, source):
+        with self._lock:
+            job_id = f"{time.strftime('%Y%m%d-%H%M%S')}-{next(self._ids)}"
+            job = {"id": job_id, "path": os.path.abspath(path), "source": source, "state": "queued",
+                   "report": os.path.abspath(os.path.join(self.jobs_dir, f"{job_id}.csv")),
+                   "submitted": time.time(), "counts": {}, "error": ""}
+            self._jobs[job_id] = job
+        self.pending.put(job_id)
+        print(f"📥 Job {job_id} queued from {source}: {job['path']}")
+        return dict(job)
+
+    def update(self, job_id, **fields):
+        with self._lock:
+            self._jobs[job_id].update(fields)
+            return dict(self._jobs[job_id])
+
+    def get(self, job_id):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return dict(job) if job else None
+
+    def all(self):
+        with self._lock:
+            return [dict(job) for job in self._jobs.values()]
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self):
+        for line in self.rfile:
+            try:
+                reply = self._dispatch(json.loads(line))
+            except Exception as e:
+                reply = {"ok": False, "error": str(e)}
+            self.wfile.write(json.dumps(reply).encode() + b"\n")
+
+    def _dispatch(self, request):
+        jobs = self.server.jobs
+        command = request.get("command")
+        if command == "submit":
+            path = request["path"]
+            if not os.path.isfile(path):
+                return {"ok": False, "error": f"no such file: {path}"}
+            return {"ok": True, "job": jobs.submit(path, "socket")}
+        if command == "status":
+            if request.get("job"):
+                job = jobs.get(request["job"])
+                return {"ok": job is not None, "job": job, "error": "" if job else "unknown job"}
+            return {"ok": True, "jobs": jobs.all(), "queued": jobs.pending.qsize()}
+        if command == "ping":
+            return {"ok": True}
+        return {"ok": False, "error": f"unknown command: {command!r}"}
+
+
+class _Server(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+def serve_socket(jobs, port):
+    server = _Server(("127.0.0.1", port), _Handler)
+    server.jobs = jobs
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    print(f"✅ Listening for jobs on 127.0.0.1:{port}.")
+    return server
+
+
+def watch_drop_folder(jobs, drop_dir, poll=DROP_POLL):
+    processing = os.path.join(drop_dir, "processing")
+    os.makedirs(processing, exist_ok=True)
+
+    def scan():
+        seen = {}  # path -> (size, mtime) at the previous scan
+        while True:
+            current = {}
+            for name in sorted(os.listdir(drop_dir)):
+                path = os.path.join(drop_dir, name)
+                # '~$' files are Excel's lock files for a workbook that is still open
+                if name.startswith(("~$", ".")) or not name.lower().endswith(SUFFIXES) or not os.path.isfile(path):
+                    continue
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                current[path] = (stat.st_size, stat.st_mtime)
+                # a file still being copied in keeps changing; take it once it has stood
+                # still for a whole scan (moving it would not fail on Linux)
+                if seen.get(path) != current[path]:
+                    continue
+                target = os.path.join(processing, f"{time.strftime('%Y%m%d-%H%M%S')}-{name}")
+                try:
+                    os.replace(path, target)
+                except OSError:
+                    continue  # locked by the writer (Windows); try again next scan
+                del current[path]
+                jobs.submit(target, "drop folder")
+            seen = current
+            time.sleep(poll)
+
+    threading.Thread(target=scan, daemon=True).start()
+    print(f"✅ Watching '{os.path.abspath(drop_dir)}' for vendor files.")
+
+
+def _finish_drop_file(job):
+    processing = os.path.dirname(job["path"])
+    if job["source"] != "drop folder" or not os.path.isfile(job["path"]):
+        return
+    target = os.path.join(os.path.dirname(processing), "done" if job["state"] == "done" else "failed")
+    os.makedirs(target, exist_ok=True)
+    shutil.move(job["path"], os.path.join(target, os.path.basename(job["path"])))
+
+
+def run_job(wizard, strategy, jobs, job_id, journal_path, monitor=None):
+    job = jobs.update(job_id, state="running", started=time.time())
+    print(f"\n=== Job {job_id}: {job['path']} ===")
+    try:
+        vendors = reader.iter_vendors(job["path"])
+    except (OSError, ValueError) as e:
+        job = jobs.update(job_id, state="failed", error=str(e), finished=time.time())
+        print(f"❌ Job {job_id} could not be read: {e}")
+        _finish_drop_file(job)
+        return True
+    if journal_path:
+        # the journal spans jobs, so a vendor already uploaded by an earlier job is skipped
+        vendors = journal.prepare_run(journal_path, vendors, resume=True)
+    if strategy == "plan":
+        vendors = flows.group_by_plan(vendors)
+    checkpoints = journal.Journal(journal_path) if journal_path else None
+    remaining = iter(vendors)
+
+    with report.RunReport(job["report"]) as run_report:
+        try:
+            healthy = runner.process(wizard, remaining, strategy, run_report.add, checkpoints, monitor=monitor)
+            error = "" if healthy else "browser could not be brought back to the vendor form"
+        except Exception as e:
+            healthy, error = False, str(e)
+        # the rest of the job is still reported, so its CSV and counts cover every row
+        for vendor in remaining:
+            run_report.add(dict(vendor.as_dict(), worker=0, status="not attempted", error=error, seconds=0.0))
+    if checkpoints:
+        checkpoints.close()
+    job = jobs.update(job_id, state="done" if healthy else "failed", error=error,
+                      counts=dict(run_report.counts), finished=time.time())
+    run_report.print_summary()
+    _finish_drop_file(job)
+    return healthy
+
+
+def _alive(wizard):
+    try:
+        wizard.driver.execute_script("return 1")
+        return True
+    except Exception:
+        return False
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Keep the vendor form open and upload batches as they arrive.")
+    parser.add_argument("--debugger-address", default=DEBUGGER_ADDRESS)
+    parser.add_argument("--strategy", choices=sorted(flows.FLOWS), default="close")
+    parser.add_argument("--port", type=int, default=DAEMON_PORT, help="local job socket; 0 to disable")
+    parser.add_argument("--drop-dir", default=DROP_DIR, help="watched folder; empty string to disable")
+    parser.add_argument("--jobs-dir", default=JOBS_DIR)
+    parser.add_argument("--fast-fill", action="store_true")
+    parser.add_argument("--journal", default=journal.JOURNAL_PATH,
+                        help="checkpoint journal shared by all jobs; pass an empty string to disable")
+    health.add_arguments(parser)
+    args = parser.parse_args()
+
+    try:
+        driver = session.attach(args.debugger_address)
+        wizard = pages.VendorWizard(driver, session.make_wait(driver), fast_fill=args.fast_fill,
+                                    reconnect=lambda: session.attach(args.debugger_address))
+        flows.prepare(wizard, args.strategy)
+        print("✅ Attached to Browser and ready on the vendor form.")
+    except Exception as e:
+        print("❌ ERROR: Could not attach to Chrome or find the '+ Add New Vendor' button.")
+        print(f"   Error details: {e}")
+        return
+
+    health_options = health.options(args)
+    # one monitor for the daemon's lifetime: the tab ages across jobs, not within one
+    monitor = health.HealthMonitor(args.health_log, **health_options) if health_options else None
+    jobs = Jobs(args.jobs_dir)
+    if args.port:
+        serve_socket(jobs, args.port)
+    if args.drop_dir:
+        watch_drop_folder(jobs, args.drop_dir)
+
+    healthy = True
+    try:
+        while True:
+            try:
+                job_id = jobs.pending.get(timeout=KEEPALIVE)
+            except queue.Empty:
+                healthy = healthy and _alive(wizard)
+                if healthy:
+                    continue
+                job_id = None
+            if not healthy:
+                print("   > Browser session is unhealthy; recovering before the next job...")
+                healthy = recovery.recover(wizard, args.strategy, recovery.SESSION_LOST) is not None
+                if not healthy:
+                    print("   > Could not recover; will try again when the next job arrives.")
+            if job_id is not None:
+                healthy = run_job(wizard, args.strategy, jobs, job_id, args.journal, monitor) if healthy else False
+                if not healthy and jobs.get(job_id)["state"] == "queued":
+                    job = jobs.update(job_id, state="failed", error="browser session unavailable")
+                    _finish_drop_file(job)
+    except KeyboardInterrupt:
+        print("\nStopping the upload daemon.")
+    if monitor:
+        monitor.close()
+
+
+if __name__ == "__main__":
+    main()
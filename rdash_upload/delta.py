@@ -0,0 +1,198 @@
+# Delta sync of the vendor master. A snapshot keeps what was last uploaded for every
+# vendor, as a hash of its normalized name and a content hash of (VendorName, TRN,
+# VendorTag). Each run hash-joins the new export against the snapshot. New vendors go
+# through the create flow, vendors whose TRN or tag changed go through the edit flow
+# (flows.run_edit), and everything else is left alone. Each vendor that succeeds is
+# appended to the snapshot straight away, so an interrupted run loses nothing.
+#
+#   python -m rdash_upload.delta --file Vendors.xlsx --dry-run    # show the diff only
+#   python -m rdash_upload.delta --file Vendors.xlsx --baseline   # record as uploaded
+#   python -m rdash_upload.delta --file Vendors.xlsx              # upload the diff
+import argparse
+import csv
+import os
+
+import numpy as np
+import pandas as pd
+
+from . import flows, pages, reader, recovery, report, runner, session, waits
+from .config import DEBUGGER_ADDRESS, EXCEL_FILE_PATH
+from .preflight import _text, name_key, normalize_trn, read_sheet
+
+SNAPSHOT_PATH = "vendor_snapshot.csv"
+SNAPSHOT_FIELDS = ["name_hash", "content_hash", "VendorName", "TRN", "VendorTag"]
+NEW, CHANGED, UNCHANGED = "new", "changed", "unchanged"
+# changed by removing a TRN or tag: the edit flow can only set values, not clear them
+REMOVED = "field removed"
+# the snapshot records the name, TRN and tag of every vendor created, and only the plan
+# flow saves all three for every row ('close' drops the tag, 'full' needs one)
+CREATE_FLOW = "plan"
+
+
+def _column(df, name):
+    return _text(df[name]) if name in df.columns else pd.Series("", index=df.index)
+
+
+def hashed(df):
+    """Normalized VendorName/TRN/VendorTag of `df` with their name and content hashes.
+    Rows without a name are dropped; of repeated names the first row is kept."""
+    current = pd.DataFrame({
+        "VendorName": _column(df, "VendorName"),
+        "TRN": normalize_trn(df["TRN"]) if "TRN" in df.columns else "",
+        "VendorTag": _column(df, "VendorTag"),
+    }, index=df.index)
+    current = current[current["VendorName"] != ""]
+    keys = name_key(current["VendorName"])
+    current["name_hash"] = pd.util.hash_pandas_object(keys, index=False).to_numpy()
+    content = pd.DataFrame({"name": keys, "trn": current["TRN"], "tag": current["VendorTag"].str.casefold()})
+    current["content_hash"] = pd.util.hash_pandas_object(content, index=False).to_numpy()
+    return current.drop_duplicates("name_hash")
+
+
+def load_snapshot(path=SNAPSHOT_PATH):
+    if not os.path.exists(path):
+        return pd.DataFrame({field: pd.Series(dtype="uint64" if field.endswith("_hash") else str)
+                             for field in SNAPSHOT_FIELDS})
+    snapshot = pd.read_csv(path, dtype={"name_hash": "uint64", "content_hash": "uint64", "VendorName": str,
+                                        "TRN": str, "VendorTag": str}, keep_default_na=False)
+    # the file is appended to as vendors succeed; the last line for a vendor wins
+    return snapshot.drop_duplicates("name_hash", keep="last")
+
+
+def diff(current, snapshot):
+    """Label each row of `current` new, changed or unchanged against `snapshot`.
+
+    The content hash covers the name, so a content hash found in the snapshot means
+    the vendor is unchanged, and a name hash found without it means it changed.
+    Changed rows get the snapshot's TRN_was and VendorTag_was for the log; those that
+    blank a TRN or tag the snapshot has are labelled REMOVED instead of CHANGED.
+    """
+    known = np.isin(current["name_hash"].to_numpy(), snapshot["name_hash"].to_numpy())
+    same = np.isin(current["content_hash"].to_numpy(), snapshot["content_hash"].to_numpy())
+    changes = current.assign(Change=np.select([~known, ~same], [NEW, CHANGED], default=UNCHANGED))
+    previous = snapshot[["name_hash", "TRN", "VendorTag"]].rename(columns={"TRN": "TRN_was", "VendorTag": "VendorTag_was"})
+    changes = changes.reset_index().merge(previous, on="name_hash", how="left").set_index("index")
+    removed = ((changes["TRN_was"].fillna("") != "") & (changes["TRN"] == "")) | (
+        (changes["VendorTag_was"].fillna("") != "") & (changes["VendorTag"] == ""))
+    changes.loc[(changes["Change"] == CHANGED) & removed, "Change"] = REMOVED
+    return changes
+
+
+def compact_snapshot(path=SNAPSHOT_PATH):
+    """Rewrite the snapshot with one line per vendor."""
+    load_snapshot(path).to_csv(path + ".tmp", index=False, columns=SNAPSHOT_FIELDS)
+    os.replace(path + ".tmp", path)
+
+
+class SnapshotWriter:
+    """Appends vendors to the snapshot as they succeed."""
+
+    def __init__(self, path=SNAPSHOT_PATH):
+        self.path = path
+        is_new = not os.path.exists(path)
+        self._handle = open(path, "a", newline="", encoding="utf-8")
+        self._writer = csv.DictWriter(self._handle, fieldnames=SNAPSHOT_FIELDS, extrasaction="ignore")
+        if is_new:
+            self._writer.writeheader()
+
+    def add(self, row):
+        self._writer.writerow({field: row[field] for field in SNAPSHOT_FIELDS})
+        self._handle.flush()
+
+    def close(self):
+        self._handle.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _vendors(changes, kind):
+    for index, row in changes[changes["Change"] == kind].iterrows():
+        yield reader.Vendor(index, row["VendorName"], row["TRN"] or None, row["VendorTag"] or None)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Upload only the vendors that are new or changed since the last run.")
+    parser.add_argument("--file", default=EXCEL_FILE_PATH)
+    parser.add_argument("--snapshot", default=SNAPSHOT_PATH)
+    parser.add_argument("--debugger-address", default=DEBUGGER_ADDRESS)
+    parser.add_argument("--report", default=report.REPORT_PATH)
+    parser.add_argument("--fast-fill", action="store_true")
+    parser.add_argument("--dry-run", action="store_true", help="write <file>.delta.csv and stop")
+    parser.add_argument("--baseline", action="store_true",
+                        help="record the whole file in the snapshot without uploading (it is already in RDash)")
+    args = parser.parse_args()
+
+    try:
+        current = hashed(read_sheet(args.file))
+    except FileNotFoundError:
+        print(f"❌ ERROR: The file '{args.file}' was not found. Please make sure it's in the same folder.")
+        return
+    changes = diff(current, load_snapshot(args.snapshot))
+    counts = changes["Change"].value_counts()
+    print(f"✅ {len(changes)} vendors in '{args.file}': {counts.get(NEW, 0)} new, "
+          f"{counts.get(CHANGED, 0)} changed, {counts.get(UNCHANGED, 0)} unchanged.")
+    if counts.get(REMOVED, 0):
+        print(f"   {counts[REMOVED]} vendors had their TRN or tag removed; they are reported for a manual edit.")
+
+    if args.dry_run:
+        delta_path = f"{os.path.splitext(args.file)[0]}.delta.csv"
+        changes[changes["Change"] != UNCHANGED].to_csv(delta_path, index_label="row")
+        print(f"   Delta written to '{delta_path}'.")
+        return
+    if args.baseline:
+        with SnapshotWriter(args.snapshot) as snapshot:
+            for _, row in changes[changes["Change"] != UNCHANGED].iterrows():
+                snapshot.add(row)
+        compact_snapshot(args.snapshot)
+        print(f"   Snapshot '{args.snapshot}' now matches '{args.file}'.")
+        return
+    if not counts.get(NEW, 0) and not counts.get(CHANGED, 0):
+        print("   Nothing to upload.")
+        return
+
+    try:
+        driver = session.attach(args.debugger_address)
+        wizard = pages.VendorWizard(driver, session.make_wait(driver), fast_fill=args.fast_fill,
+                                    reconnect=lambda: session.attach(args.debugger_address))
+        flows.prepare(wizard, CREATE_FLOW)
+        print("✅ Script Attached to Browser Successfully.")
+    except Exception as e:
+        print("❌ ERROR: Could not attach to Chrome.")
+        print(f"   Error details: {e}")
+        return
+
+    existing = []
+    with SnapshotWriter(args.snapshot) as snapshot, report.RunReport(args.report) as run_report:
+        def on_result(result):
+            run_report.add(result)
+            if result["status"] == "success":
+                snapshot.add(changes.loc[result["row"]])
+            elif result["status"] == "duplicate" and result["worker"] == "create":
+                # already in RDash but not in the snapshot: bring it up to date with an edit
+                existing.append(reader.Vendor(result["row"], result["VendorName"], result["TRN"], result["VendorTag"]))
+
+        # not touched, and not recorded, so they come up again until the sheet and RDash agree
+        for vendor in _vendors(changes, REMOVED):
+            run_report.add(dict(vendor.as_dict(), worker="edit", status="needs_check", seconds=0.0,
+                                error="TRN or tag removed from the sheet; the edit flow cannot clear it"))
+
+        print(f"\n--- Creating {counts.get(NEW, 0)} new vendors ---")
+        healthy = runner.process(wizard, _vendors(changes, NEW), CREATE_FLOW, on_result, worker="create")
+        if healthy:
+            # fixed before the pass starts: edit results never add to it
+            edits = list(_vendors(changes, CHANGED)) + existing
+            print(f"\n--- Editing {len(edits)} changed vendors ---")
+            healthy = runner.process(wizard, edits, "edit", on_result, worker="edit")
+        if not healthy:
+            print("   > Stopping: the browser could not be brought back to the vendor list.")
+    compact_snapshot(args.snapshot)
+    run_report.print_summary(waits.STATS.summary(), recovery.STATS.summary())
+    wizard.driver.quit()
+
+
+if __name__ == "__main__":
+    main()
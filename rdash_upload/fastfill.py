@@ -0,0 +1,92 @@
+# Fast-fill: fills a whole wizard page in one execute_async_script call instead of a
+# WebDriver command per click and per keystroke. Values are set through the native
+# input value setter and followed by bubbling input/change events, which is what
+# React's controlled inputs listen to. The script reads the form back before it
+# submits, and reports anything it could not do so the caller can fall back to
+# send_keys.
+from selenium.common.exceptions import WebDriverException
+
+from .locators import LOCATE_JS, js_locator
+
+_FILL_JS = LOCATE_JS + """
+var reveal = arguments[0], fields = arguments[1], submit = arguments[2], timeoutMs = arguments[3];
+var done = arguments[arguments.length - 1];
+var deadline = Date.now() + timeoutMs;
+var result = {revealed: false, filled: false, submitted: false, reason: null, values: {}};
+
+function visible(el) { return !!(el && el.offsetParent !== null && !el.disabled); }
+function until(test, then) {
+  (function poll() {
+    var value = test();
+    if (value) return then(value);
+    if (Date.now() > deadline) { result.reason = 'timed out'; return done(result); }
+    setTimeout(poll, 20);
+  })();
+}
+
+function fill() {
+  until(function () {
+    var els = {};
+    for (var name in fields) {
+      var el = document.querySelector('input[name="' + name + '"], textarea[name="' + name + '"]');
+      if (!visible(el)) return null;
+      els[name] = el;
+    }
+    return els;
+  }, function (els) {
+    for (var name in fields) {
+      var el = els[name];
+      var setter = Object.getOwnPropertyDescriptor(Object.getPrototypeOf(el), 'value').set;
+      el.focus();
+      setter.call(el, fields[name]);
+      el.dispatchEvent(new Event('input', {bubbles: true}));
+      el.dispatchEvent(new Event('change', {bubbles: true}));
+      el.dispatchEvent(new FocusEvent('blur', {bubbles: true}));
+    }
+    result.filled = true;
+    // give React a frame to re-render and run its validation
+    setTimeout(function () {
+      for (var name in fields) {
+        var el = els[name];
+        result.values[name] = el.value;
+        if (el.value !== fields[name]) { result.reason = name + ' did not keep its value'; return done(result); }
+        if (el.getAttribute('aria-invalid') === 'true' || el.closest('.Mui-error')) {
+          result.reason = name + ' failed validation'; return done(result);
+        }
+      }
+      if (!submit) return done(result);
+      until(function () { var b = locate(submit); return visible(b) && b; }, function (button) {
+        button.click();
+        result.submitted = true;
+        done(result);
+      });
+    }, 50);
+  });
+}
+
+if (reveal) {
+  until(function () { return locate(reveal); }, function (el) { el.click(); result.revealed = true; fill(); });
+} else {
+  fill();
+}
+"""
+
+
+def fill_page(driver, fields, submit=None, reveal=None, within=None, timeout=10):
+    """Fill `fields` ({input name: value}) and click `submit`, all in one round trip.
+
+    `reveal` is clicked first (e.g. 'Do not have Trade License Number'). `within` is
+    a CSS container locator the submit locator is relative to. Returns the script's
+    result dict; result["submitted"] is False if the caller has to finish the page.
+    """
+    driver.set_script_timeout(timeout + 5)
+    try:
+        return driver.execute_async_script(
+            _FILL_JS,
+            js_locator(reveal) if reveal else None,
+            {name: str(value) for name, value in fields.items()},
+            js_locator(submit, within) if submit else None,
+            int(timeout * 1000),
+        )
+    except WebDriverException as e:
+        return {"revealed": False, "filled": False, "submitted": False, "reason": str(e).strip(), "values": {}}
@@ -0,0 +1,313 @@
+# The four vendor wizard flows from the original scripts, written against the
+# VendorWizard page object so they can be driven from any session:
+#   back   - Vendor_Upload.py: opens the form once, then driver.back() after each vendor
+#   reopen - vendor2.py:       '+ Add New Vendor' for every vendor, driver.back() afterwards
+#   close  - vendor4.py:       closes the side panel with the X once the KYC step is done
+#   full   - rdashvendor.py:   full 12 step wizard including the vendor tag
+# plus 'edit', which updates the TRN and tag of a vendor that already exists (used by
+# delta.py for changed rows), and 'plan', which compiles each row into the shortest step sequence that saves what
+# the row actually has (see WIZARD and plan() below).
+import functools
+from collections import namedtuple
+
+from . import waits
+
+PLAN_WINDOW = 256  # rows buffered and regrouped by plan at a time
+
+
+def has_value(value):
+    # same check as `pd.notna(trn) and str(trn).strip()` without needing pandas here
+    if value is None or value != value:
+        return False
+    return bool(str(value).strip())
+
+
+def _open_form(wizard, step):
+    with wizard.step("open_form", f"   > {step}: Clicking '+ Add New Vendor'..."):
+        wizard.open_form()
+
+
+def _basic_details(wizard, vendor_name, steps):
+    fast = None
+    if wizard.fast_fill:
+        with wizard.step("basic_fast", f"   > {steps[0]}-{steps[2]}: Filling basic details in one go: '{vendor_name}'..."):
+            fast = wizard.fast_basic_details(vendor_name)
+        if fast["submitted"]:
+            wizard.submitted = True
+            return
+
+    if not (fast and fast["revealed"]):
+        with wizard.step("no_trade_license", f"   > {steps[0]}: Clicking 'Do not have Trade License'..."):
+            wizard.no_trade_license()
+
+    with wizard.step("company_name", f"   > {steps[1]}: Entering Company Name: '{vendor_name}'..."):
+        wizard.enter_company_name(vendor_name, clear=bool(fast and fast["filled"]))
+
+    with wizard.step("add_continue", f"   > {steps[2]}: Clicking first 'Add & Continue'..."):
+        # the click may land even if waiting for the next page then fails
+        wizard.submitted = True
+        wizard.add_and_continue()
+
+
+def _kyc(wizard, trn, steps):
+    if has_value(trn):
+        fast = None
+        if wizard.fast_fill:
+            with wizard.step("kyc_fast", f"   > {steps[0]}-{steps[1]}: TRN found. Filling KYC in one go: '{trn}'..."):
+                fast = wizard.fast_kyc(trn)
+            if fast["submitted"]:
+                return True
+
+        with wizard.step("trn", f"   > {steps[0]}: TRN found. Entering TRN: '{trn}'..."):
+            wizard.enter_trn(trn, clear=bool(fast and fast["filled"]))
+
+        with wizard.step("kyc_continue", f"   > {steps[1]}: Clicking second 'Add & Continue'..."):
+            wizard.kyc_continue()
+        return True
+    with wizard.step("kyc_skip", f"   > {steps[0].split('/')[0]}-{steps[1]}: No TRN in Excel file. Skipping KYC page..."):
+        wizard.skip()
+    return False
+
+
+def prepare(wizard, strategy):
+    waits.install_xhr_tracker(wizard.driver)
+    # ONE-TIME ACTION for the 'back' flow: enter the "Add Vendor" form
+    if strategy == "back":
+        wizard.log("   > Clicking '+ Add New Vendor' once to begin...")
+        wizard.open_form()
+
+
+def run_back(wizard, vendor):
+    _basic_details(wizard, vendor.name, ("1/5", "2/5", "3/5"))
+    submitted = waits.network_settled(wizard.driver)
+    _kyc(wizard, vendor.trn, ("4/5", "5/5"))
+
+    with wizard.step("confirm", "   > Waiting for success confirmation..."):
+        wizard.settle(waits.toast_shown, waits.bank_header_shown, submitted, legacy=3)
+
+    with wizard.step("back", "   > Navigating back to the new vendor form..."):
+        wizard.back()
+        wizard.wait_for_form()
+
+
+def run_reopen(wizard, vendor):
+    _open_form(wizard, "1/6")
+    _basic_details(wizard, vendor.name, ("2/6", "3/6", "4/6"))
+    submitted = waits.network_settled(wizard.driver)
+    _kyc(wizard, vendor.trn, ("5/6", "6/6"))
+
+    with wizard.step("confirm", "   > Waiting for success confirmation..."):
+        wizard.settle(waits.toast_shown, waits.bank_header_shown, submitted, legacy=3)
+
+    with wizard.step("back", "   > Navigating back to prepare for next vendor..."):
+        wizard.back()
+        wizard.wait_for_vendor_list()
+
+
+def run_close(wizard, vendor):
+    _open_form(wizard, "1/7")
+    _basic_details(wizard, vendor.name, ("2/7", "3/7", "4/7"))
+    with wizard.step("kyc_page"):
+        wizard.wait_for_kyc()
+    _kyc(wizard, vendor.trn, ("5/7", "6/7"))
+
+    with wizard.step("close", "   > 7/7: Waiting for next page and closing form with the 'X' button..."):
+        wizard.wait_for_bank_details()
+        wizard.close_panel()
+
+    with wizard.step("closed", "   > Waiting for form to close completely..."):
+        wizard.wait_closed()
+
+
+def run_full(wizard, vendor):
+    _open_form(wizard, "1/12")
+    _basic_details(wizard, vendor.name, ("2/12", "3/12", "4/12"))
+    if _kyc(wizard, vendor.trn, ("5/12", "6/12")):
+        with wizard.step("bank_page", "   > Waiting for Bank Details page to load..."):
+            wizard.settle(waits.bank_header_shown, legacy=3)
+
+    with wizard.step("skip_bank", "   > 7/12: Skipping Bank Details page with a direct click..."):
+        wizard.skip_bank_details()
+
+    with wizard.step("skip_other", "   > 8/12: Skipping Other Details page..."):
+        wizard.skip()
+
+    with wizard.step("skip_user", "   > 9/12: Skipping Vendor User Details page..."):
+        wizard.skip_user_details()
+
+    with wizard.step("tag", f"   > 10-11/12: Selecting tag: '{vendor.tag}'..."):
+        wizard.select_tag(vendor.tag)
+
+    with wizard.step("final_add", "   > 12/12: Clicking final 'Add' button..."):
+        wizard.final_add()
+
+    with wizard.step("closed", "   > Waiting for the form to close completely..."):
+        wizard.wait_closed()
+        wizard.settle(waits.vendor_list_ready, legacy=0.5)
+
+
+def run_edit(wizard, vendor):
+    with wizard.step("find", f"   > 1/4: Searching for '{vendor.name}' in the vendor list..."):
+        wizard.find_vendor(vendor.name)
+
+    with wizard.step("open_edit", "   > 2/4: Opening the vendor for editing..."):
+        wizard.open_edit()
+
+    with wizard.step("edit_fields", f"   > 3/4: Updating TRN '{vendor.trn or ''}' and tag '{vendor.tag or ''}'..."):
+        if has_value(vendor.trn):
+            wizard.edit_trn(vendor.trn)
+        if has_value(vendor.tag):
+            wizard.edit_tag(vendor.tag)
+
+    with wizard.step("save", "   > 4/4: Saving changes..."):
+        wizard.save()
+        wizard.wait_closed()
+        wizard.settle(waits.vendor_list_ready, legacy=0.5)
+
+
+# -- Declarative wizard --------------------------------------------------------
+# The wizard as data. Each page names the step that confirms it is showing (arrive),
+# the vendor field it takes, the step that fills it or skips past it, and the step
+# that submits the whole form from it, if any. Any page after 'basic' can also be
+# left with the X: the vendor exists once the basic details are saved.
+
+Page = namedtuple("Page", "name arrive field fill skip submit")
+
+WIZARD = (
+    Page("basic", "open_form", "name", "basic", None, None),
+    Page("kyc", "kyc_page", "trn", "trn", "kyc_skip", None),
+    Page("bank", "bank_page", None, None, "skip_bank", None),
+    Page("other", None, None, None, "skip_other", None),
+    Page("user", None, None, None, "skip_user", None),
+    Page("tags", None, "tag", "tag", None, "final_add"),
+)
+
+
+def plan(vendor):
+    """Compile `vendor` into the shortest tuple of step names that saves all its fields.
+
+    The wizard is walked up to the last page with a value for this row. It is then left
+    through that page's submit step if it has one. Otherwise the next page is awaited,
+    which confirms the last one was saved, and the panel is closed with the X. A row with
+    no TRN and no tag closes as soon as the KYC page shows. A row with a TRN closes on Bank
+    Details. Only rows with a VendorTag walk the Skip pages and open the tag dropdown.
+    """
+    last = max(i for i, page in enumerate(WIZARD) if page.field and has_value(getattr(vendor, page.field)))
+    steps = []
+    for page in WIZARD[:last + 1]:
+        if page.arrive:
+            steps.append(page.arrive)
+        steps.append(page.fill if page.field and has_value(getattr(vendor, page.field)) else page.skip)
+    if WIZARD[last].submit:
+        steps.append(WIZARD[last].submit)
+    else:
+        following = WIZARD[last + 1]
+        if following.arrive:
+            steps.append(following.arrive)
+        steps.append("close")
+    return tuple(steps)
+
+
+def _waiting(name, message, action):
+    def run(wizard, vendor, labels):
+        with wizard.step(name, message):
+            action(wizard)
+    return run
+
+
+def _clicking(name, message, action):
+    def run(wizard, vendor, labels):
+        with wizard.step(name, f"   > {labels[0]}: {message}..."):
+            action(wizard)
+    return run
+
+
+def _select_tag(wizard, vendor, labels):
+    with wizard.step("tag", f"   > {labels[0]}-{labels[1]}: Selecting tag: '{vendor.tag}'..."):
+        wizard.select_tag(vendor.tag)
+
+
+def _final_add(wizard, vendor, labels):
+    with wizard.step("final_add", f"   > {labels[0]}: Clicking final 'Add' button..."):
+        wizard.final_add()
+    with wizard.step("closed", "   > Waiting for the form to close completely..."):
+        wizard.wait_closed()
+        wizard.settle(waits.vendor_list_ready, legacy=0.5)
+
+
+def _close(wizard, vendor, labels):
+    with wizard.step("close", f"   > {labels[0]}: Closing form with the 'X' button..."):
+        wizard.close_panel()
+    with wizard.step("closed", "   > Waiting for form to close completely..."):
+        wizard.wait_closed()
+
+
+# step name -> (numbered steps it shows in the log, runner(wizard, vendor, labels))
+STEPS = {
+    "open_form": (1, lambda wizard, vendor, labels: _open_form(wizard, labels[0])),
+    "basic": (3, lambda wizard, vendor, labels: _basic_details(wizard, vendor.name, labels)),
+    "kyc_page": (0, _waiting("kyc_page", None, lambda wizard: wizard.wait_for_kyc())),
+    "trn": (2, lambda wizard, vendor, labels: _kyc(wizard, vendor.trn, labels)),
+    "kyc_skip": (2, lambda wizard, vendor, labels: _kyc(wizard, None, labels)),
+    # arrival steps must raise when the page never shows: that is how a refused TRN is
+    # caught before the panel is closed and the row counted as a success
+    "bank_page": (0, _waiting("bank_page", "   > Waiting for Bank Details page to load...",
+                              lambda wizard: wizard.wait_for_bank_details())),
+    "skip_bank": (1, _clicking("skip_bank", "Skipping Bank Details page with a direct click",
+                               lambda wizard: wizard.skip_bank_details())),
+    "skip_other": (1, _clicking("skip_other", "Skipping Other Details page", lambda wizard: wizard.skip())),
+    "skip_user": (1, _clicking("skip_user", "Skipping Vendor User Details page",
+                               lambda wizard: wizard.skip_user_details())),
+    "tag": (2, _select_tag),
+    "final_add": (1, _final_add),
+    "close": (1, _close),
+}
+
+
+@functools.lru_cache(maxsize=None)
+def _numbered(steps):
+    total = sum(STEPS[name][0] for name in steps)
+    numbered, done = [], 0
+    for name in steps:
+        width = STEPS[name][0]
+        numbered.append((STEPS[name][1], tuple(f"{done + i + 1}/{total}" for i in range(width))))
+        done += width
+    return tuple(numbered)
+
+
+def run_plan(wizard, vendor):
+    for run, labels in _numbered(plan(vendor)):
+        run(wizard, vendor, labels)
+
+
+def group_by_plan(vendors, window=PLAN_WINDOW):
+    """Reorder `vendors` so rows with the same plan run back to back.
+
+    Rows are regrouped `window` at a time, so input is still streamed. Within a window,
+    groups keep the order of their first row and rows keep their order within a group.
+    """
+    buffered = []
+
+    def flush():
+        groups = {}
+        for vendor in buffered:
+            groups.setdefault(plan(vendor), []).append(vendor)
+        buffered.clear()
+        for group in groups.values():
+            yield from group
+
+    for vendor in vendors:
+        buffered.append(vendor)
+        if len(buffered) >= window:
+            yield from flush()
+    yield from flush()
+
+
+FLOWS = {
+    "back": run_back,
+    "reopen": run_reopen,
+    "close": run_close,
+    "full": run_full,
+    "edit": run_edit,
+    "plan": run_plan,
+}
@@ -0,0 +1,171 @@
+# Browser health monitoring for long runs. Every few vendors the run loop samples the
+# tab's CDP Performance.getMetrics (JS heap, DOM nodes, event listeners) next to our
+# own per-vendor latency. When a limit or the vendor budget is crossed, the tab or
+# session is recycled between two vendors, where the page is back at the state the
+# flow starts from. Every sample goes to a CSV, so the memory and latency curve of a
+# run can be plotted afterwards.
+import csv
+import statistics
+import time
+from collections import deque
+
+from . import flows, waits
+from .config import (HEALTH_EVERY, HEAP_LIMIT_MB, LATENCY_FACTOR, LISTENERS_LIMIT, NODES_LIMIT,
+                     RECYCLE_BUDGET)
+
+HEALTH_LOG_PATH = "health_log.csv"
+FIELDS = ["time", "vendors", "heap_mb", "nodes", "listeners", "documents", "latency_p50", "baseline_p50", "action"]
+RECYCLE_MODES = ("reload", "tab", "session")
+
+
+def metrics(driver):
+    driver.execute_cdp_cmd("Performance.enable", {})
+    values = {m["name"]: m["value"] for m in driver.execute_cdp_cmd("Performance.getMetrics", {})["metrics"]}
+    return {
+        "heap_mb": values.get("JSHeapUsedSize", 0) / 2 ** 20,
+        "nodes": int(values.get("Nodes", 0)),
+        "listeners": int(values.get("JSEventListeners", 0)),
+        "documents": int(values.get("Documents", 0)),
+    }
+
+
+def _reload(wizard):
+    wizard.reload()
+
+
+def _new_tab(wizard):
+    # a fresh tab gets a fresh JS heap and DOM; a reload can keep the renderer's leaks
+    driver = wizard.driver
+    url, old = driver.current_url, driver.current_window_handle
+    driver.switch_to.new_window("tab")
+    driver.get(url)
+    new = driver.current_window_handle
+    driver.switch_to.window(old)
+    driver.close()
+    driver.switch_to.window(new)
+    wizard.new_page()
+    wizard.settle(waits.vendor_list_ready, legacy=3)
+
+
+def _new_session(wizard):
+    # a self-launched browser comes back fresh; an attached one still needs the reload
+    wizard.reattach()
+    wizard.reload()
+
+
+_RECYCLE = {"reload": _reload, "tab": _new_tab, "session": _new_session}
+
+
+class HealthMonitor:
+    def __init__(self, log_path=HEALTH_LOG_PATH, recycle="tab", every=HEALTH_EVERY, heap_mb=HEAP_LIMIT_MB,
+                 nodes=NODES_LIMIT, listeners=LISTENERS_LIMIT, latency_factor=LATENCY_FACTOR,
+                 budget=RECYCLE_BUDGET):
+        self.recycle_mode = recycle
+        self.every = every
+        self.limits = {"heap_mb": heap_mb, "nodes": nodes, "listeners": listeners}
+        self.latency_factor = latency_factor
+        self.budget = budget
+        self.recycles = 0
+        self._vendors = 0          # since the last recycle
+        self._total = 0
+        self._latency = deque(maxlen=every)
+        self._baseline = None
+        self._handle = open(log_path, "w", newline="", encoding="utf-8") if log_path else None
+        if self._handle:
+            self._writer = csv.DictWriter(self._handle, fieldnames=FIELDS)
+            self._writer.writeheader()
+
+    def observe(self, seconds):
+        """Record one finished vendor."""
+        self._vendors += 1
+        self._total += 1
+        self._latency.append(seconds)
+        if self._baseline is None and len(self._latency) == self._latency.maxlen:
+            self._baseline = statistics.median(self._latency)
+
+    def _reason(self, sample, latency):
+        for name, limit in self.limits.items():
+            if limit and sample[name] > limit:
+                return f"{name} {sample[name]:,.0f} over {limit:,}"
+        if self._baseline and latency and latency > self._baseline * self.latency_factor:
+            return f"median vendor time {latency:.1f}s over {self.latency_factor}x {self._baseline:.1f}s"
+        return None
+
+    def check(self, wizard, strategy):
+        """Call between vendors. Samples every `every` vendors and recycles if needed;
+        returns False if the recycle failed and the session needs recovery."""
+        # the budget is checked after every vendor; the metrics only every `every` vendors
+        over_budget = bool(self.budget) and self._vendors >= self.budget
+        if not self._vendors or (self._vendors % self.every and not over_budget):
+            return True
+        latency = statistics.median(self._latency) if self._latency else None
+        try:
+            sample = metrics(wizard.driver)
+        except Exception as e:
+            wizard.log(f"   > Health: could not read browser metrics ({str(e).strip().splitlines()[0]}).")
+            if not over_budget:
+                return True
+            sample = dict.fromkeys(("heap_mb", "nodes", "listeners", "documents"), 0)
+        if over_budget:
+            reason = f"vendor budget of {self.budget} reached"
+        else:
+            reason = self._reason(sample, latency)
+        self._write(sample, latency, f"recycle {self.recycle_mode}: {reason}" if reason else "")
+        if not reason:
+            return True
+
+        wizard.log(f"\n--- Health: {reason}. Recycling the {self.recycle_mode} before the next vendor... ---")
+        started = time.monotonic()
+        try:
+            with wizard.step("recycle"):
+                _RECYCLE[self.recycle_mode](wizard)
+                flows.prepare(wizard, strategy)
+        except Exception as e:
+            wizard.log(f"   > Recycle failed: {str(e).strip().splitlines()[0] if str(e).strip() else type(e).__name__}")
+            return False
+        self.recycles += 1
+        self._vendors = 0
+        self._latency.clear()
+        self._baseline = None
+        wizard.log(f"   > Recycled in {time.monotonic() - started:.1f}s.")
+        return True
+
+    def _write(self, sample, latency, action):
+        if not self._handle:
+            return
+        self._writer.writerow(dict(sample, time=round(time.time(), 3), vendors=self._total,
+                                   heap_mb=round(sample["heap_mb"], 1),
+                                   latency_p50=round(latency, 3) if latency else "",
+                                   baseline_p50=round(self._baseline, 3) if self._baseline else "",
+                                   action=action))
+        self._handle.flush()
+
+    def summary(self):
+        return f"Health: {self.recycles} recycles ({self.recycle_mode}) over {self._total} vendors."
+
+    def close(self):
+        if self._handle:
+            self._handle.close()
+
+
+def add_arguments(parser):
+    parser.add_argument("--health-log", default=HEALTH_LOG_PATH,
+                        help="CSV of browser metrics and vendor latency; pass an empty string to disable monitoring")
+    parser.add_argument("--recycle", choices=RECYCLE_MODES, default="tab",
+                        help="what to recycle when the browser gets unhealthy")
+    parser.add_argument("--health-every", type=int, default=HEALTH_EVERY, help="vendors between samples")
+    parser.add_argument("--heap-limit", type=float, default=HEAP_LIMIT_MB, help="JS heap limit in MB")
+    parser.add_argument("--nodes-limit", type=int, default=NODES_LIMIT)
+    parser.add_argument("--listeners-limit", type=int, default=LISTENERS_LIMIT)
+    parser.add_argument("--latency-factor", type=float, default=LATENCY_FACTOR)
+    parser.add_argument("--recycle-budget", type=int, default=RECYCLE_BUDGET,
+                        help="vendors per tab/session before a recycle regardless of metrics; 0 for none")
+
+
+def options(args):
+    """HealthMonitor keyword arguments from the command line, or None if disabled."""
+    if not args.health_log:
+        return None
+    return {"recycle": args.recycle, "every": args.health_every, "heap_mb": args.heap_limit,
+            "nodes": args.nodes_limit, "listeners": args.listeners_limit,
+            "latency_factor": args.latency_factor, "budget": args.recycle_budget}
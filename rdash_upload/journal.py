@@ -0,0 +1,131 @@
+# Persistent per-row checkpoint journal (SQLite, WAL mode) so an interrupted run can be
+# resumed without submitting the same vendor twice. Rows are keyed by a hash of the
+# normalised VendorName + TRN. Each worker process opens its own connection; SQLite
+# serialises the writes and claim() makes sure only one worker ever owns a row.
+import hashlib
+import sqlite3
+import time
+
+PENDING = "pending"
+IN_FLIGHT = "in_flight"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+# failed after the vendor was submitted: it may exist in RDash, so it is never claimed again
+NEEDS_CHECK = "needs_check"
+
+JOURNAL_PATH = "run_journal.sqlite"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS vendors (
+    key         TEXT PRIMARY KEY,
+    row         INTEGER,
+    vendor_name TEXT,
+    trn         TEXT,
+    state       TEXT NOT NULL,
+    attempts    INTEGER NOT NULL DEFAULT 0,
+    worker      INTEGER,
+    error       TEXT,
+    created_at  REAL NOT NULL,
+    updated_at  REAL NOT NULL
+)
+"""
+
+
+def row_key(vendor_name, trn):
+    name = " ".join(str(vendor_name).split()).casefold()
+    trn = "" if trn is None or trn != trn else str(trn).strip()
+    return hashlib.sha1(f"{name}|{trn}".encode("utf-8")).hexdigest()
+
+
+class Journal:
+    def __init__(self, path=JOURNAL_PATH):
+        self.path = path
+        # autocommit mode; every statement below is its own small transaction
+        self.conn = sqlite3.connect(path, timeout=30, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute(_SCHEMA)
+
+    def start_fresh(self):
+        """Set every row from earlier runs back to pending (a fresh, non-resumed run)."""
+        self.conn.execute("UPDATE vendors SET state = ?, updated_at = ?", (PENDING, time.time()))
+
+    def keys_in_state(self, state):
+        return {key for (key,) in self.conn.execute("SELECT key FROM vendors WHERE state = ?", (state,))}
+
+    def reset(self, keys):
+        now = time.time()
+        self.conn.executemany("UPDATE vendors SET state = ?, updated_at = ? WHERE key = ?",
+                              [(PENDING, now, key) for key in keys])
+
+    def claim(self, vendor, worker):
+        """Mark a vendor in flight, adding it to the journal if it is new. Returns False
+        if it is already done or owned by another worker."""
+        now = time.time()
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            self.conn.execute(
+                "INSERT OR IGNORE INTO vendors (key, row, vendor_name, trn, state, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (vendor.key, vendor.row, vendor.name, vendor.trn, PENDING, now, now))
+            cur = self.conn.execute(
+                "UPDATE vendors SET state = ?, worker = ?, attempts = attempts + 1, updated_at = ? "
+                "WHERE key = ? AND state IN (?, ?)",
+                (IN_FLIGHT, worker, now, vendor.key, PENDING, FAILED))
+            self.conn.execute("COMMIT")
+        except BaseException:
+            self.conn.execute("ROLLBACK")
+            raise
+        return cur.rowcount == 1
+
+    def finish(self, key, status, error=""):
+        """Record the outcome of a claimed vendor from its report status."""
+        state = {"success": SUCCEEDED, "duplicate": SUCCEEDED, "needs_check": NEEDS_CHECK}.get(status, FAILED)
+        self.conn.execute("UPDATE vendors SET state = ?, error = ?, updated_at = ? WHERE key = ?",
+                          (state, error, time.time(), key))
+
+    def counts(self):
+        return dict(self.conn.execute("SELECT state, COUNT(*) FROM vendors GROUP BY state"))
+
+    def close(self):
+        self.conn.close()
+
+
+def _skip_done(vendors, skip, in_flight, needs_check):
+    for vendor in vendors:
+        # may or may not have been created in RDash - check it by hand
+        if vendor.key in in_flight:
+            print(f"   ⚠️ '{vendor.name}' was in flight when the last run stopped. Not retrying it.")
+        elif vendor.key in needs_check:
+            print(f"   ⚠️ '{vendor.name}' failed after it was submitted last time. Not retrying it.")
+        if vendor.key not in skip:
+            yield vendor
+
+
+def prepare_run(path, vendors, resume=False, retry_in_flight=False):
+    """Set up the journal for a run and return the vendors that still need processing."""
+    checkpoints = Journal(path)
+    try:
+        if not resume:
+            checkpoints.start_fresh()
+            return vendors
+        done = checkpoints.keys_in_state(SUCCEEDED)
+        in_flight = checkpoints.keys_in_state(IN_FLIGHT)
+        needs_check = checkpoints.keys_in_state(NEEDS_CHECK)
+        if retry_in_flight:
+            checkpoints.reset(in_flight | needs_check)
+            in_flight, needs_check = set(), set()
+        print(f"   > Resuming: {len(done)} vendors already done will be skipped.")
+        return _skip_done(vendors, done | in_flight | needs_check, in_flight, needs_check)
+    finally:
+        checkpoints.close()
+
+
+def add_arguments(parser):
+    parser.add_argument("--journal", default=JOURNAL_PATH,
+                        help="checkpoint journal; pass an empty string to disable")
+    parser.add_argument("--resume", action="store_true",
+                        help="skip vendors the journal already marks as succeeded")
+    parser.add_argument("--retry-in-flight", action="store_true",
+                        help="with --resume, also retry vendors that were mid-submit when the last run died "
+                             "or failed after they were submitted (needs_check)")
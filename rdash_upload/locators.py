@@ -0,0 +1,104 @@
+# Every locator for the RDash vendor wizard, defined once. CSS/attribute selectors are
+# used wherever the element has a stable attribute; the remaining text matches start
+# from the text node (//span[text()=...]/ancestor::button) instead of testing the
+# descendants of every button in the MUI DOM. Locators marked "in FOOTER" are relative
+# and resolved inside the cached side panel footer (see pages.VendorWizard).
+from selenium.webdriver.common.by import By
+
+# page level
+ADD_NEW_VENDOR = (By.XPATH, "//span[text()='+ Add New Vendor']/ancestor::button[1]")
+BACKDROP = (By.CSS_SELECTOR, ".MuiModal-backdrop")
+SUCCESS_TOAST = (By.CSS_SELECTOR, ".MuiSnackbar-root .MuiAlert-standardSuccess, .MuiSnackbar-root .MuiAlert-filledSuccess")
+OPEN_DROPDOWN = (By.CSS_SELECTOR, "[role='listbox'], .MuiPopover-paper, .MuiAutocomplete-popper")
+BODY = (By.TAG_NAME, "body")
+VALIDATION_ERROR = (By.CSS_SELECTOR, ".Mui-error, [aria-invalid='true']")
+DUPLICATE_MESSAGE = (By.XPATH, "//*[contains(text(),'already exists')]")
+
+# side panel
+FOOTER = (By.CSS_SELECTOR, "div.side-panel-footer")
+CLOSE_X = (By.CSS_SELECTOR, "button:has(svg[data-testid='CloseRoundedIcon'])")
+CANCEL_OR_CLOSE = (By.CSS_SELECTOR, "button[data-testid='CloseRoundedIcon'], button:has(svg[data-testid='CloseRoundedIcon'])")
+CANCEL = (By.XPATH, "//span[text()='Cancel']/ancestor::button[1]")
+
+# 1. basic details
+NO_TRADE_LICENSE = (By.XPATH, "//span[text()='Do not have Trade License Number']")
+COMPANY_NAME = (By.CSS_SELECTOR, "input[name='companyName']")
+ADD_CONTINUE = (By.CSS_SELECTOR, "button[title='Add & Continue']")
+
+# 2. KYC
+KYC_HEADER = (By.XPATH, "//*[contains(text(),'Add KYC Details')]")
+TRN_INPUT = (By.CSS_SELECTOR, "input[name='TRN']")
+ADD_CONTINUE_TEXT = (By.XPATH, ".//span[text()='Add & Continue']/ancestor::button[1]")  # in FOOTER
+SKIP = (By.XPATH, ".//span[text()='Skip']/ancestor::button[1]")  # in FOOTER
+SKIP_TITLE = (By.CSS_SELECTOR, "button[title='Skip']")  # in FOOTER
+
+# 3-5. bank, other and vendor user details
+BANK_HEADER = (By.XPATH, "//*[text()='Add Bank Details']")
+
+# 6. tags
+TAGS_DROPDOWN = (By.XPATH, "//div[div[text()='Select vendor Tags']]/following-sibling::div")
+FINAL_ADD = (By.CSS_SELECTOR, "button[title='Add']")
+
+
+# editing an existing vendor (delta sync): search the vendor list, open the vendor's
+# panel, switch it to edit mode and save. Check these against the live page if the
+# edit flow fails on the first vendor.
+VENDOR_SEARCH = (By.CSS_SELECTOR, "input[type='search'], input[placeholder*='Search']")
+EDIT_VENDOR = (By.XPATH, "//span[text()='Edit']/ancestor::button[1]")
+KYC_TAB = (By.XPATH, "//*[@role='tab'][contains(., 'KYC')]")
+TAGS_TAB = (By.XPATH, "//*[@role='tab'][contains(., 'Tag')]")
+SAVE = (By.XPATH, "//span[text()='Save' or text()='Update']/ancestor::button[1]")
+
+
+def _xpath_literal(text):
+    if "'" not in text:
+        return f"'{text}'"
+    if '"' not in text:
+        return f'"{text}"'
+    return "concat('" + "', \"'\", '".join(text.split("'")) + "')"
+
+
+def vendor_row(vendor_name):
+    name = _xpath_literal(str(vendor_name))
+    return (By.XPATH, f"//*[@role='row' or self::tr][.//*[normalize-space(text())={name}]]")
+
+
+def tag_option(vendor_tag):
+    escaped = str(vendor_tag).replace("\\", "\\\\").replace('"', '\\"')
+    return (By.CSS_SELECTOR, f'span[title="{escaped}"]')
+
+
+# In-page counterpart of find_element for the scripts that run inside the page
+# (fastfill.py, cdp.py): locate() takes the list js_locator() builds from a locator
+# above, optionally resolved inside a container ("in FOOTER").
+LOCATE_JS = """
+function locate(loc) {
+  var root = loc[2] ? document.querySelector(loc[2]) : document;
+  if (!root) return null;
+  if (loc[0] === 'xpath')
+    return document.evaluate(loc[1], root, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+  if (loc[0] === 'name') return root.querySelector('[name="' + loc[1] + '"]');
+  if (loc[0] === 'class name') return root.querySelector('.' + loc[1]);
+  return root.querySelector(loc[1]);
+}
+"""
+
+
+def js_locator(locator, within=None):
+    by, value = locator
+    return [by, value, within[1] if within else None]
+
+
+# the text XPaths the original scripts used, kept for bench_locators.py
+LEGACY = {
+    "ADD_NEW_VENDOR": (By.XPATH, "//button[.//span[text()='+ Add New Vendor']]"),
+    "COMPANY_NAME": (By.NAME, "companyName"),
+    "ADD_CONTINUE": (By.XPATH, "//button[@title='Add & Continue']"),
+    "ADD_CONTINUE_TEXT": (By.XPATH, "//button[.//span[text()='Add & Continue']]"),
+    "TRN_INPUT": (By.NAME, "TRN"),
+    "SKIP": (By.XPATH, "//div[@class='side-panel-footer']//button[.//span[text()='Skip']]"),
+    "SKIP_TITLE": (By.XPATH, "//div[@class='side-panel-footer']//button[@title='Skip']"),
+    "CLOSE_X": (By.XPATH, "//button[.//svg[@data-testid='CloseRoundedIcon']]"),
+    "BACKDROP": (By.CLASS_NAME, "MuiModal-backdrop"),
+    "FINAL_ADD": (By.XPATH, "//button[@title='Add']"),
+}
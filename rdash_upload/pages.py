@@ -0,0 +1,274 @@
+# Page-object model of the RDash vendor side panel. One VendorWizard per browser
+# session; every page action the scripts perform is a method here, so the flows only
+# describe the order of the steps.
+#
+# Stable containers (the side panel footer) are looked up once per wizard page and
+# cached; footer buttons are then searched inside that element instead of across the
+# whole document on every WebDriverWait poll. The cache is dropped whenever a click
+# moves the wizard to another page, or when the element goes stale.
+#
+# With a trace.Tracer attached, step() spans record how long each step took and how
+# much of that was spent waiting on the page. Either way, step_times keeps how long
+# each step of the current vendor took (read by the adaptive scheduler).
+#
+# With fast_fill=True the basic details and KYC pages are filled and submitted in one
+# injected script each (see fastfill.py), falling back to send_keys when the script
+# cannot confirm the form state.
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+from selenium.common.exceptions import NoSuchElementException, StaleElementReferenceException
+from selenium.webdriver.common.keys import Keys
+from selenium.webdriver.support import expected_conditions as EC
+
+from . import fastfill, session, waits
+from . import locators as L
+
+
+class VendorWizard:
+    def __init__(self, driver, wait, log=print, tracer=None, fast_fill=False, reconnect=None):
+        self.driver = driver
+        self.reconnect = reconnect  # returns a fresh driver when the session is lost
+        self.wait = wait
+        self.log = log
+        self.tracer = tracer
+        self.fast_fill = fast_fill
+        self.fast_fill_stats = Counter()
+        self.step_times = {}
+        # set once the current attempt has submitted the basic details page: the vendor may exist
+        self.submitted = False
+        self._containers = {}
+
+    @contextmanager
+    def step(self, name, message=None):
+        if message:
+            self.log(message)
+        span = self.tracer.open_span(name) if self.tracer is not None else None
+        started = time.monotonic()
+        ok = False
+        try:
+            yield
+            ok = True
+        finally:
+            self.step_times[name] = time.monotonic() - started
+            if span is not None:
+                self.tracer.close_span(span, ok)
+
+    def _waited(self, started):
+        if self.tracer is not None:
+            self.tracer.add_wait(time.monotonic() - started)
+
+    def settle(self, *signals, legacy):
+        started = time.monotonic()
+        try:
+            return waits.settle(self.driver, *signals, legacy=legacy)
+        finally:
+            self._waited(started)
+
+    # -- element lookup --------------------------------------------------
+
+    def container(self, locator):
+        element = self._containers.get(locator)
+        if element is None:
+            element = self._containers[locator] = self.driver.find_element(*locator)
+        return element
+
+    def new_page(self):
+        self._containers.clear()
+
+    def _until(self, locator, within, ready):
+        def condition(driver):
+            try:
+                root = self.container(within) if within else driver
+                for element in root.find_elements(*locator):
+                    if ready(element):
+                        return element
+            except NoSuchElementException:
+                pass
+            except StaleElementReferenceException:
+                self.new_page()
+            return False
+
+        started = time.monotonic()
+        try:
+            return self.wait.until(condition)
+        finally:
+            self._waited(started)
+
+    def clickable(self, locator, within=None):
+        return self._until(locator, within, lambda e: e.is_displayed() and e.is_enabled())
+
+    def visible(self, locator, within=None):
+        return self._until(locator, within, lambda e: e.is_displayed())
+
+    def present(self, locator, within=None):
+        return self._until(locator, within, lambda e: True)
+
+    def click(self, locator, within=None):
+        self.clickable(locator, within).click()
+
+    # -- vendor list page ------------------------------------------------
+
+    def open_form(self):
+        self.click(L.ADD_NEW_VENDOR)
+        self.new_page()
+
+    def wait_for_vendor_list(self):
+        self.present(L.ADD_NEW_VENDOR)
+
+    def find_vendor(self, vendor_name):
+        field = self.visible(L.VENDOR_SEARCH)
+        field.send_keys(Keys.CONTROL, "a")
+        field.send_keys(Keys.DELETE)
+        field.send_keys(vendor_name)
+        self.click(L.vendor_row(vendor_name))
+        self.new_page()
+
+    def open_edit(self):
+        self.click(L.EDIT_VENDOR)
+        self.new_page()
+
+    def edit_trn(self, trn):
+        self.click(L.KYC_TAB)
+        self.enter_trn(trn, clear=True)
+
+    def edit_tag(self, vendor_tag):
+        self.click(L.TAGS_TAB)
+        self.select_tag(vendor_tag)
+
+    def save(self):
+        self.click(L.SAVE)
+        self.new_page()
+
+    # -- basic details ---------------------------------------------------
+
+    def wait_for_form(self):
+        self.present(L.NO_TRADE_LICENSE)
+
+    def no_trade_license(self):
+        self.click(L.NO_TRADE_LICENSE)
+
+    def enter_company_name(self, vendor_name, clear=False):
+        field = self.visible(L.COMPANY_NAME)
+        if clear:
+            field.send_keys(Keys.CONTROL, "a")
+            field.send_keys(Keys.DELETE)
+        field.send_keys(vendor_name)
+
+    def fast_fill_summary(self):
+        return (f"Fast fill: {self.fast_fill_stats['fast']} pages in one script, "
+                f"{self.fast_fill_stats['fallback']} fell back to send_keys.")
+
+    def _fast(self, page, **kwargs):
+        started = time.monotonic()
+        result = fastfill.fill_page(self.driver, **kwargs)
+        self._waited(started)
+        if result["submitted"]:
+            self.fast_fill_stats["fast"] += 1
+            self.new_page()
+        else:
+            self.fast_fill_stats["fallback"] += 1
+            self.log(f"   > Fast fill of the {page} page failed ({result['reason']}). Falling back to typing...")
+        return result
+
+    def fast_basic_details(self, vendor_name):
+        """Fill and submit the basic details page in one script. Returns the fastfill
+        result; if result["submitted"] is False the page still has to be finished."""
+        return self._fast("basic details", fields={"companyName": vendor_name},
+                          submit=L.ADD_CONTINUE, reveal=L.NO_TRADE_LICENSE)
+
+    def add_and_continue(self):
+        self.click(L.ADD_CONTINUE)
+        self.new_page()
+
+    # -- KYC -------------------------------------------------------------
+
+    def wait_for_kyc(self):
+        self.visible(L.KYC_HEADER)
+
+    def enter_trn(self, trn, clear=False):
+        field = self.visible(L.TRN_INPUT)
+        if clear:
+            field.send_keys(Keys.CONTROL, "a")
+            field.send_keys(Keys.DELETE)
+        field.send_keys(str(trn))
+
+    def fast_kyc(self, trn):
+        return self._fast("KYC", fields={"TRN": trn}, submit=L.ADD_CONTINUE_TEXT, within=L.FOOTER)
+
+    def kyc_continue(self):
+        self.click(L.ADD_CONTINUE_TEXT, within=L.FOOTER)
+        self.new_page()
+
+    def skip(self):
+        self.click(L.SKIP, within=L.FOOTER)
+        self.new_page()
+
+    # -- bank / other / user details ---------------------------------------
+
+    def wait_for_bank_details(self):
+        self.visible(L.BANK_HEADER)
+
+    def skip_bank_details(self):
+        # the Skip button on this page is covered by an overlay, so click it with JS
+        button = self.present(L.SKIP, within=L.FOOTER)
+        self.driver.execute_script("arguments[0].click();", button)
+        self.new_page()
+
+    def skip_user_details(self):
+        self.click(L.SKIP_TITLE, within=L.FOOTER)
+        self.new_page()
+
+    # -- tags ------------------------------------------------------------
+
+    def select_tag(self, vendor_tag):
+        self.click(L.TAGS_DROPDOWN)
+        self.click(L.tag_option(vendor_tag))
+        self.driver.find_element(*L.BODY).click()
+        self.settle(waits.dropdown_closed, legacy=0.5)
+
+    def final_add(self):
+        self.click(L.FINAL_ADD)
+        self.new_page()
+
+    # -- leaving the panel -------------------------------------------------
+
+    def close_panel(self):
+        self.click(L.CLOSE_X)
+        self.new_page()
+
+    def wait_closed(self):
+        started = time.monotonic()
+        try:
+            self.wait.until(EC.invisibility_of_element_located(L.BACKDROP))
+        finally:
+            self._waited(started)
+
+    def cancel(self):
+        """Best-effort close of whatever panel is open; raises if there is none."""
+        buttons = self.driver.find_elements(*L.CANCEL) or self.driver.find_elements(*L.CANCEL_OR_CLOSE)
+        if not buttons:
+            raise NoSuchElementException("no Cancel or close button on the page")
+        buttons[0].click()
+        self.new_page()
+        self.wait_closed()
+
+    def back(self):
+        self.driver.back()
+        self.new_page()
+
+    def reattach(self):
+        try:
+            self.driver.quit()
+        except Exception:
+            pass  # the session is usually already gone
+        self.driver = self.reconnect()
+        self.wait = session.make_wait(self.driver)
+        self.new_page()
+
+    def reload(self):
+        self.driver.refresh()
+        self.new_page()
+        self.settle(waits.vendor_list_ready, legacy=3)
+        waits.install_xhr_tracker(self.driver)
@@ -0,0 +1,226 @@
+# Worker-pool mode: splits the vendor sheet into shards and drives each shard from its
+# own process with its own Chrome/chromedriver session.
+#
+#   python -m rdash_upload.parallel --ports 9211 9212 9213
+#   python -m rdash_upload.parallel --headless 4 --start-url https://.../manage-vendor --state rdash_state.json
+#   python -m rdash_upload.parallel --ports 9211 9212 --resume    # continue an interrupted run
+#   python -m rdash_upload.parallel --headless 8 --adaptive --max-per-minute 40 ...
+#
+# Every Chrome on --ports must already be logged in and sitting on the 'Manage Vendor' page.
+# Headless instances are started and owned by their worker, logged in from a state file
+# exported with `python -m rdash_upload.pool export-state`, and skip images, fonts and
+# trackers (config.BLOCKED_URLS) unless --no-block is given.
+import argparse
+import multiprocessing
+import queue
+import threading
+import time
+
+from . import flows, health, journal, pages, reader, recovery, report, runner, scheduler, session, trace, waits
+from .config import BLOCKED_URLS, CHROME_DRIVER_PATH, DEBUGGER_ADDRESS, EXCEL_FILE_PATH
+
+QUEUE_DEPTH = 4  # vendors buffered per worker; keeps memory flat on huge files
+
+
+def _stats():
+    return {"waits": waits.STATS.as_dict(), "recovery": recovery.STATS.as_dict()}
+
+
+def _gated(tasks, worker_id, active):
+    """Tasks for this worker, taken only while it is among the `active` sessions."""
+    while True:
+        while worker_id >= active.value:
+            time.sleep(0.5)
+        vendor = tasks.get()
+        if vendor is None:
+            return
+        yield vendor
+
+
+def _worker(worker_id, endpoint, tasks, results, strategy, start_url, journal_path, trace_path, fast_fill,
+            headless_options, health_options, active, bucket):
+    def log(msg):
+        print(f"[w{worker_id}] {msg}", flush=True)
+
+    def connect():
+        if endpoint == "headless":
+            return session.launch_headless(start_url, **headless_options)
+        return session.attach(endpoint)
+
+    try:
+        driver = connect()
+        tracer = trace.Tracer(trace.worker_path(trace_path, worker_id), worker_id) if trace_path else None
+        wizard = pages.VendorWizard(driver, session.make_wait(driver), log, tracer, fast_fill, reconnect=connect)
+        log(f"✅ Worker attached to {endpoint}.")
+    except Exception as e:
+        log(f"❌ ERROR: Could not start a session on {endpoint}: {e}")
+        results.put(("done", _stats()))
+        return
+
+    checkpoints = journal.Journal(journal_path) if journal_path else None
+    monitor = (health.HealthMonitor(trace.worker_path(health_options.pop("log_path"), worker_id), **health_options)
+               if health_options else None)
+    try:
+        flows.prepare(wizard, strategy)
+    except Exception as e:
+        log(f"❌ ERROR: Could not open the vendor form: {e}")
+    else:
+        # every worker pulls its next vendor from the shared queue, so the shards are
+        # formed on the fly and a slow session never holds the others up
+        vendors = _gated(tasks, worker_id, active)
+        if not runner.process(wizard, vendors, strategy, lambda r: results.put(("result", r)),
+                              checkpoints, worker_id, monitor=monitor,
+                              on_attempt=lambda r: results.put(("attempt", r)), bucket=bucket):
+            log("   > Worker stopping; the other workers carry on with the rest of the sheet.")
+
+    wizard.driver.quit()
+    if checkpoints:
+        checkpoints.close()
+    if tracer:
+        tracer.close()
+    if monitor:
+        monitor.close()
+        log(f"   {monitor.summary()}")
+    results.put(("done", _stats()))
+
+
+def _put(tasks, item, workers):
+    while True:
+        try:
+            tasks.put(item, timeout=1)
+            return True
+        except queue.Full:
+            if not any(w.is_alive() for w in workers):
+                return False
+
+
+def _feed(vendors, tasks, workers, active, draining):
+    for vendor in vendors:
+        if not _put(tasks, vendor, workers):
+            return
+    # paused workers must wake up to take their end-of-input marker
+    with active.get_lock():
+        draining.set()
+        active.value = len(workers)
+    for _ in workers:
+        if not _put(tasks, None, workers):
+            return
+
+
+def run(vendors, endpoints, on_result, strategy="close", start_url=None, journal_path=None, trace_path=None,
+        fast_fill=False, headless_options=None, health_options=None, bucket=None, controller=None):
+    """Stream `vendors` through one worker process per endpoint. `on_result` is called
+    in this process for every finished vendor; returns the merged WaitStats and RecoveryStats.
+    `headless_options` are passed to session.launch_headless for "headless" endpoints;
+    `health_options` (HealthMonitor arguments plus log_path) give every worker a monitor.
+    A scheduler.TokenBucket `bucket`, made with a spawn context so the workers' retries
+    share it, caps vendors started per minute, and a scheduler.AIMD `controller` sets how
+    many of the workers take vendors; it also sees the attempts queued for a retry."""
+    # spawn keeps each worker's Selenium state fully separate (and matches Windows)
+    ctx = multiprocessing.get_context("spawn")
+    # when the scheduler is pacing vendors, keep few of them queued ahead of the workers
+    depth = 1 if bucket or controller else QUEUE_DEPTH
+    tasks = ctx.Queue(maxsize=depth * len(endpoints))
+    results = ctx.Queue()
+    active = ctx.Value("i", controller.active if controller else len(endpoints))
+    workers = [ctx.Process(target=_worker, daemon=True,
+                           args=(i, endpoint, tasks, results, strategy, start_url, journal_path, trace_path, fast_fill,
+                                 headless_options or {}, health_options, active, bucket))
+               for i, endpoint in enumerate(endpoints)]
+    for w in workers:
+        w.start()
+    if bucket:
+        vendors = scheduler.throttle(vendors, bucket)
+    draining = threading.Event()
+    feeder = threading.Thread(target=_feed, args=(vendors, tasks, workers, active, draining), daemon=True)
+    feeder.start()
+
+    wait_stats = waits.WaitStats()
+    recovery_stats = recovery.RecoveryStats()
+    finished = 0
+    while finished < len(workers):
+        try:
+            kind, payload = results.get(timeout=1)
+        except queue.Empty:
+            if not any(w.is_alive() for w in workers):
+                break
+            continue
+        if kind in ("result", "attempt"):
+            if kind == "result":
+                on_result(payload)
+            sessions = controller.observe(payload) if controller else None
+            if sessions is not None:
+                with active.get_lock():
+                    if not draining.is_set():
+                        active.value = sessions
+        else:
+            wait_stats.merge(payload["waits"])
+            recovery_stats.merge(payload["recovery"])
+            finished += 1
+    for w in workers:
+        w.join(timeout=5)
+    return wait_stats, recovery_stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Upload vendors with several browser sessions in parallel.")
+    parser.add_argument("--file", default=EXCEL_FILE_PATH)
+    parser.add_argument("--ports", nargs="*", type=int, default=[],
+                        help="debugger ports of already running Chrome instances")
+    parser.add_argument("--headless", type=int, default=0,
+                        help="number of self-launched headless Chrome instances")
+    parser.add_argument("--start-url", help="page the headless instances open (the 'Manage Vendor' page)")
+    parser.add_argument("--state", help="storage state the headless instances log in with (pool.py export-state)")
+    parser.add_argument("--no-block", action="store_true",
+                        help="let the headless instances load images, fonts and trackers")
+    parser.add_argument("--driver-path", default=CHROME_DRIVER_PATH, help="chromedriver for the headless instances")
+    parser.add_argument("--strategy", choices=sorted(flows.FLOWS), default="close")
+    parser.add_argument("--report", default=report.REPORT_PATH)
+    parser.add_argument("--fast-fill", action="store_true",
+                        help="fill each wizard page with one injected script instead of send_keys")
+    journal.add_arguments(parser)
+    trace.add_arguments(parser)
+    health.add_arguments(parser)
+    scheduler.add_arguments(parser)
+    args = parser.parse_args()
+
+    endpoints = [f"127.0.0.1:{port}" for port in args.ports] + ["headless"] * args.headless
+    if not endpoints:
+        endpoints = [DEBUGGER_ADDRESS]
+    if "headless" in endpoints and not args.start_url:
+        parser.error("--start-url is required with --headless")
+
+    try:
+        vendors = reader.iter_vendors(args.file)
+    except FileNotFoundError:
+        print(f"❌ ERROR: The file '{args.file}' was not found. Please make sure it's in the same folder.")
+        return
+    print(f"✅ Streaming vendors from '{args.file}'.")
+
+    if args.journal:
+        vendors = journal.prepare_run(args.journal, vendors, args.resume, args.retry_in_flight)
+    if args.strategy == "plan":
+        vendors = flows.group_by_plan(vendors)
+
+    bucket = scheduler.bucket_from_args(args, multiprocessing.get_context("spawn"))
+    controller = (scheduler.AIMD(len(endpoints), args.initial_sessions, target=args.target_submit,
+                                 max_error_rate=args.max_error_rate) if args.adaptive else None)
+    print(f"   > Starting {len(endpoints)} workers"
+          + (f", {controller.active} active to begin with" if controller else "")
+          + (f", at most {args.max_per_minute:g} vendors/min" if bucket else "") + "...")
+    with report.RunReport(args.report) as run_report:
+        wait_stats, recovery_stats = run(vendors, endpoints, run_report.add, args.strategy, args.start_url,
+                                         args.journal or None, args.trace or None, args.fast_fill,
+                                         {"driver_path": args.driver_path, "block": [] if args.no_block else BLOCKED_URLS,
+                                          "state": session.read_state(args.state) if args.state else None},
+                                         dict(health.options(args), log_path=args.health_log) if args.health_log else None,
+                                         bucket, controller)
+    run_report.print_summary(wait_stats.summary(), recovery_stats.summary(),
+                             *([controller.summary()] if controller else []),
+                             *([f"Rate cap: waited {bucket.waited:.0f}s for tokens."] if bucket else []))
+    if args.trace:
+        trace.report(args, [trace.worker_path(args.trace, i) for i in range(len(endpoints))])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+# Headless pool helpers. The pool itself is parallel.py --headless N: each worker
+# starts and owns a private headless Chrome, logs it in from an exported storage
+# state and blocks images, fonts and trackers through CDP. This module exports that
+# state and measures what the headless, blocked session saves against the visible one.
+#
+#   python -m rdash_upload.pool export-state                 # from the logged-in Chrome on 9211
+#   python -m rdash_upload.pool compare --start-url https://.../manage-vendor --state rdash_state.json
+#   python -m rdash_upload.pool compare ... --visible-trace visible.jsonl --pool-trace pool.w*.jsonl
+#
+# compare only opens and cancels the Add Vendor panel; it never submits anything.
+import argparse
+import glob
+import json
+import statistics
+import time
+
+from . import locators as L
+from . import pages, session, trace
+from .config import BLOCKED_URLS, CHROME_DRIVER_PATH, DEBUGGER_ADDRESS, STATE_PATH
+
+_RESOURCES_JS = """
+var entries = performance.getEntriesByType('resource');
+var bytes = 0;
+for (var i = 0; i < entries.length; i++) bytes += entries[i].transferSize || 0;
+var nav = performance.getEntriesByType('navigation')[0];
+return {requests: entries.length, bytes: bytes, load: nav ? nav.loadEventEnd / 1000 : null};
+"""
+
+
+def measure(wizard, start_url, loads, transitions):
+    """Median page load, time to a usable vendor list, panel open/close and page weight."""
+    samples = {"page load": [], "vendor list ready": [], "open panel": [], "close panel": []}
+    weight = {}
+    for _ in range(loads):
+        started = time.monotonic()
+        wizard.driver.get(start_url)
+        wizard.wait_for_vendor_list()
+        samples["vendor list ready"].append(time.monotonic() - started)
+        weight = wizard.driver.execute_script(_RESOURCES_JS)
+        if weight["load"]:
+            samples["page load"].append(weight["load"])
+    wizard.clickable(L.ADD_NEW_VENDOR)
+    for _ in range(transitions):
+        started = time.monotonic()
+        wizard.open_form()
+        wizard.wait_for_form()
+        samples["open panel"].append(time.monotonic() - started)
+        started = time.monotonic()
+        wizard.cancel()
+        samples["close panel"].append(time.monotonic() - started)
+    medians = {name: statistics.median(values) for name, values in samples.items() if values}
+    return medians, weight
+
+
+def _row(name, visible, headless, unit="s"):
+    if visible is None or headless is None:
+        return f"{name:<24}{'-':>12}{'-':>12}{'-':>12}"
+    saved = f"{(1 - headless / visible) * 100:.0f}%" if visible else "-"
+    if unit == "s":
+        return f"{name:<24}{visible:>11.2f}s{headless:>11.2f}s{saved:>12}"
+    return f"{name:<24}{visible:>12,.0f}{headless:>12,.0f}{saved:>12}"
+
+
+def compare(args):
+    results = {}
+    visible = session.attach(args.debugger_address, args.driver_path)
+    headless = session.launch_headless(None, args.driver_path,
+                                       state=session.read_state(args.state) if args.state else None,
+                                       block=[] if args.no_block else BLOCKED_URLS)
+    try:
+        for label, driver in (("visible", visible), ("headless", headless)):
+            print(f"   > Measuring the {label} browser...")
+            wizard = pages.VendorWizard(driver, session.make_wait(driver), log=lambda msg: None)
+            results[label] = measure(wizard, args.start_url, args.loads, args.transitions)
+    finally:
+        headless.quit()
+
+    (visible_times, visible_weight), (headless_times, headless_weight) = results["visible"], results["headless"]
+    print(f"\n{'':<24}{'visible':>12}{'headless':>12}{'saved':>12}")
+    for name in ("page load", "vendor list ready", "open panel", "close panel"):
+        print(_row(name, visible_times.get(name), headless_times.get(name)))
+    print(_row("requests", visible_weight.get("requests"), headless_weight.get("requests"), unit=""))
+    print(_row("bytes transferred", visible_weight.get("bytes"), headless_weight.get("bytes"), unit=""))
+
+    if args.visible_trace and args.pool_trace:
+        visible_steps = trace.summarize(sorted(glob.glob(args.visible_trace)))
+        pool_steps = trace.summarize(sorted(glob.glob(args.pool_trace)))
+        print(f"\n{'step (p50)':<24}{'visible':>12}{'headless':>12}{'saved':>12}")
+        for step, stats in visible_steps["steps"].items():
+            if step in pool_steps["steps"]:
+                print(_row(step, stats["p50"], pool_steps["steps"][step]["p50"]))
+        print(f"{'vendors/min':<24}{visible_steps['vendors_per_minute']:>12.1f}"
+              f"{pool_steps['vendors_per_minute']:>12.1f}")
+
+
+def export(args):
+    driver = session.attach(args.debugger_address, args.driver_path)
+    state = session.export_state(driver)
+    with open(args.output, "w", encoding="utf-8") as handle:
+        json.dump(state, handle, indent=2)
+    print(f"✅ Saved {len(state['cookies'])} cookies and the localStorage of "
+          f"{state['origins'][0]['origin']} to '{args.output}'.")
+    print("   This file logs anyone in as you: keep it private and re-export when the session expires.")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless pool helpers.")
+    parser.add_argument("--debugger-address", default=DEBUGGER_ADDRESS)
+    parser.add_argument("--driver-path", default=CHROME_DRIVER_PATH)
+    commands = parser.add_subparsers(dest="command", required=True)
+    export_parser = commands.add_parser("export-state", help="save cookies and localStorage of the logged-in Chrome")
+    export_parser.add_argument("--output", default=STATE_PATH)
+    compare_parser = commands.add_parser("compare", help="time the visible browser against a headless one")
+    compare_parser.add_argument("--start-url", required=True, help="the 'Manage Vendor' page")
+    compare_parser.add_argument("--state", default=STATE_PATH)
+    compare_parser.add_argument("--no-block", action="store_true")
+    compare_parser.add_argument("--loads", type=int, default=5)
+    compare_parser.add_argument("--transitions", type=int, default=5)
+    compare_parser.add_argument("--visible-trace", help="trace of a run on the visible browser (glob)")
+    compare_parser.add_argument("--pool-trace", help="traces of a parallel.py --headless run (glob)")
+    args = parser.parse_args()
+
+    if args.command == "export-state":
+        export(args)
+    else:
+        compare(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+# Streaming input layer. Vendors are read lazily, one compact Vendor record at a time,
+# from a read-only openpyxl cursor, a CSV file or Parquet row batches, so memory stays
+# flat however large the export is and the first vendor can be submitted straight away.
+import csv
+import os
+
+from . import journal
+
+COLUMNS = ("VendorName", "TRN", "VendorTag")
+PARQUET_BATCH_SIZE = 4096
+
+
+class Vendor:
+    __slots__ = ("row", "name", "trn", "tag", "key")
+
+    def __init__(self, row, name, trn=None, tag=None):
+        self.row = row
+        self.name = name
+        self.trn = trn
+        self.tag = tag
+        self.key = journal.row_key(name, trn)
+
+    def __getstate__(self):
+        return (self.row, self.name, self.trn, self.tag, self.key)
+
+    def __setstate__(self, state):
+        self.row, self.name, self.trn, self.tag, self.key = state
+
+    def as_dict(self):
+        return {"row": self.row, "VendorName": self.name, "TRN": self.trn, "VendorTag": self.tag, "key": self.key}
+
+    def __repr__(self):
+        return f"Vendor(row={self.row}, name={self.name!r}, trn={self.trn!r}, tag={self.tag!r})"
+
+
+def _text(value):
+    if value is None or value != value:
+        return None
+    if isinstance(value, float) and value.is_integer():
+        # Excel stores TRNs as numbers; 100333206900003.0 -> "100333206900003"
+        value = int(value)
+    value = str(value).strip()
+    return value or None
+
+
+def _trn(value):
+    value = _text(value)
+    if value and value.endswith(".0") and value[:-2].isdigit():
+        value = value[:-2]
+    return value
+
+
+def _records(header, rows):
+    try:
+        name_at = header.index("VendorName")
+    except ValueError:
+        raise ValueError(f"input has no 'VendorName' column (found {header})")
+    trn_at = header.index("TRN") if "TRN" in header else None
+    tag_at = header.index("VendorTag") if "VendorTag" in header else None
+    # row numbers match the DataFrame index the scripts used to print
+    for index, values in enumerate(rows):
+        name = _text(values[name_at]) if name_at < len(values) else None
+        if name is None:
+            continue
+        trn = _trn(values[trn_at]) if trn_at is not None and trn_at < len(values) else None
+        tag = _text(values[tag_at]) if tag_at is not None and tag_at < len(values) else None
+        yield Vendor(index, name, trn, tag)
+
+
+def _xlsx(path, sheet):
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    worksheet = workbook[sheet] if sheet else workbook.worksheets[0]
+
+    def rows():
+        try:
+            cursor = worksheet.iter_rows(values_only=True)
+            header = [_text(h) for h in next(cursor, ())]
+            yield from _records(header, cursor)
+        finally:
+            workbook.close()
+
+    return rows()
+
+
+def _csv(path):
+    handle = open(path, newline="", encoding="utf-8-sig")
+
+    def rows():
+        with handle:
+            cursor = csv.reader(handle)
+            header = [_text(h) for h in next(cursor, [])]
+            yield from _records(header, cursor)
+
+    return rows()
+
+
+def _parquet(path, batch_size):
+    try:
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ImportError("Reading Parquet files needs pyarrow: pip install pyarrow")
+
+    parquet = pq.ParquetFile(path)
+    columns = [c for c in COLUMNS if c in parquet.schema_arrow.names]
+
+    def rows():
+        def values():
+            for batch in parquet.iter_batches(batch_size=batch_size, columns=columns):
+                yield from zip(*(batch.column(c).to_pylist() for c in columns))
+
+        yield from _records(columns, values())
+
+    return rows()
+
+
+def iter_vendors(path, sheet=None, batch_size=PARQUET_BATCH_SIZE):
+    """Open `path` and return an iterator of Vendor records.
+
+    The file is opened right away (so a missing file raises FileNotFoundError here)
+    but rows are only parsed as the iterator is consumed.
+    """
+    if not os.path.exists(path):
+        raise FileNotFoundError(path)
+    extension = os.path.splitext(path)[1].lower()
+    if extension in (".xlsx", ".xlsm"):
+        return _xlsx(path, sheet)
+    if extension == ".csv":
+        return _csv(path)
+    if extension in (".parquet", ".pq"):
+        return _parquet(path, batch_size)
+    raise ValueError(f"Unsupported vendor file type '{extension}' (use .xlsx, .csv or .parquet)")
@@ -0,0 +1,184 @@
+# Failure classification, tiered recovery and the retry queue.
+#
+# A failed vendor is classified first. Each class starts recovery at its own tier,
+# cheapest first, and escalates only if that tier fails:
+#   close    - close the side panel (Cancel / X) and wait for the backdrop to go
+#   reopen   - browser back to the previous SPA route, then close any panel left open
+#   reload   - full driver.refresh() of the SPA
+#   reattach - drop the WebDriver session and attach / launch a new one
+# Transient failures go into a retry queue with exponential backoff that is drained
+# at the end of the run, but only if the attempt failed before the vendor was
+# submitted; validation errors and duplicates are final.
+import heapq
+import time
+from collections import Counter
+
+from selenium.common.exceptions import (ElementClickInterceptedException, ElementNotInteractableException,
+                                        InvalidSessionIdException, NoSuchWindowException,
+                                        StaleElementReferenceException, WebDriverException)
+from . import flows
+from . import locators as L
+from .config import RETRY_ATTEMPTS, RETRY_BASE_DELAY
+
+STALE = "stale element"
+TIMEOUT = "timeout"
+VALIDATION = "validation error"
+DUPLICATE = "duplicate vendor"
+SESSION_LOST = "session lost"
+
+TIERS = ["close", "reopen", "reload", "reattach"]
+FIRST_TIER = {STALE: "close", VALIDATION: "close", DUPLICATE: "close", TIMEOUT: "reopen", SESSION_LOST: "reattach"}
+TRANSIENT = {STALE, TIMEOUT, SESSION_LOST}
+
+_SESSION_LOST_TEXT = ("chrome not reachable", "disconnected", "target window already closed",
+                      "no such window", "invalid session id", "session deleted")
+
+
+def _session_lost(e):
+    if isinstance(e, (InvalidSessionIdException, NoSuchWindowException, ConnectionError)):
+        return True
+    # chromedriver itself gone: urllib3 raises before we get a WebDriverException
+    if type(e).__name__ in ("MaxRetryError", "NewConnectionError", "ProtocolError"):
+        return True
+    return isinstance(e, WebDriverException) and any(text in str(e).lower() for text in _SESSION_LOST_TEXT)
+
+
+def _shown(driver, locator):
+    try:
+        return any(el.is_displayed() for el in driver.find_elements(*locator))
+    except WebDriverException:
+        return False
+
+
+def classify(e, driver):
+    if _session_lost(e):
+        return SESSION_LOST
+    if isinstance(e, (StaleElementReferenceException, ElementClickInterceptedException,
+                      ElementNotInteractableException)):
+        return STALE
+    # a wait that timed out is often the form refusing to move on; look at why
+    if _shown(driver, L.DUPLICATE_MESSAGE):
+        return DUPLICATE
+    if _shown(driver, L.VALIDATION_ERROR):
+        return VALIDATION
+    return TIMEOUT
+
+
+class RecoveryStats:
+    def __init__(self):
+        self.counts = Counter()
+        self.seconds = Counter()
+        self.failures = Counter()
+
+    def record(self, tier, seconds):
+        self.counts[tier] += 1
+        self.seconds[tier] += seconds
+
+    def as_dict(self):
+        return {"counts": dict(self.counts), "seconds": dict(self.seconds), "failures": dict(self.failures)}
+
+    def merge(self, other):
+        self.counts.update(other["counts"])
+        self.seconds.update(other["seconds"])
+        self.failures.update(other["failures"])
+
+    def summary(self):
+        if not self.failures:
+            return "Recovery: no failures."
+        classes = ", ".join(f"{c}: {n}" for c, n in self.failures.most_common())
+        tiers = ", ".join(f"{t} x{self.counts[t]} ({self.seconds[t]:.1f}s)" for t in TIERS if self.counts[t])
+        return f"Recovery: failures by class - {classes}. Recoveries by tier - {tiers or 'none'}."
+
+
+STATS = RecoveryStats()
+
+
+def _close(wizard, strategy):
+    wizard.cancel()
+    flows.prepare(wizard, strategy)
+
+
+def _reopen(wizard, strategy):
+    wizard.back()
+    if strategy == "back":
+        wizard.wait_for_form()
+        return
+    if _shown(wizard.driver, L.BACKDROP):
+        wizard.cancel()
+    wizard.clickable(L.ADD_NEW_VENDOR)
+    flows.prepare(wizard, strategy)
+
+
+def _reload(wizard, strategy):
+    wizard.reload()
+    flows.prepare(wizard, strategy)
+
+
+def _reattach(wizard, strategy):
+    wizard.reattach()
+    flows.prepare(wizard, strategy)
+
+
+_TIER_ACTIONS = {"close": _close, "reopen": _reopen, "reload": _reload, "reattach": _reattach}
+
+
+def recover(wizard, strategy, failure):
+    """Bring the page back to where `strategy` starts a vendor, starting at the tier
+    for `failure` and escalating. Returns the tier that worked, or None."""
+    STATS.failures[failure] += 1
+    for tier in TIERS[TIERS.index(FIRST_TIER[failure]):]:
+        if tier == "reattach" and wizard.reconnect is None:
+            break
+        wizard.log(f"   > Recovering ({failure}): {tier}...")
+        started = time.monotonic()
+        try:
+            _TIER_ACTIONS[tier](wizard, strategy)
+            return tier
+        except Exception as e:
+            wizard.log(f"   > '{tier}' did not work: {str(e).strip().splitlines()[0] if str(e).strip() else type(e).__name__}")
+        finally:
+            STATS.record(tier, time.monotonic() - started)
+    return None
+
+
+def may_have_created(wizard):
+    """Whether the current attempt got as far as submitting the new vendor, so that
+    running the create flow again could add it twice."""
+    return wizard.submitted
+
+
+class RetryQueue:
+    """Vendors waiting for another attempt, ordered by when they are due."""
+
+    def __init__(self, attempts=RETRY_ATTEMPTS, base_delay=RETRY_BASE_DELAY):
+        self.attempts = attempts
+        self.base_delay = base_delay
+        self._heap = []
+        self._order = 0
+
+    def __len__(self):
+        return len(self._heap)
+
+    def offer(self, vendor, attempt):
+        """Queue `vendor` after its `attempt`-th failure. Returns False when it is out of attempts."""
+        if attempt >= self.attempts:
+            return False
+        due = time.monotonic() + self.base_delay * 2 ** (attempt - 1)
+        self._order += 1
+        heapq.heappush(self._heap, (due, self._order, vendor, attempt))
+        return True
+
+    def drain(self):
+        """Yield (vendor, attempt) as each one becomes due, sleeping in between."""
+        while self._heap:
+            due, _, vendor, attempt = heapq.heappop(self._heap)
+            delay = due - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            yield vendor, attempt
+
+    def drain_now(self):
+        """Empty the queue without waiting (the session is gone)."""
+        while self._heap:
+            _, _, vendor, attempt = heapq.heappop(self._heap)
+            yield vendor, attempt
@@ -0,0 +1,41 @@
+# Run report shared by the runners: one CSV row per vendor, written as results arrive.
+import csv
+import time
+from collections import Counter
+
+REPORT_PATH = "run_report.csv"
+FIELDS = ["row", "VendorName", "TRN", "VendorTag", "key", "worker", "status", "error", "seconds"]
+
+
+class RunReport:
+    def __init__(self, path=REPORT_PATH):
+        self.path = path
+        self.counts = Counter()
+        self.started = time.monotonic()
+        self._handle = open(path, "w", newline="", encoding="utf-8")
+        self._writer = csv.DictWriter(self._handle, fieldnames=FIELDS, extrasaction="ignore")
+        self._writer.writeheader()
+
+    def add(self, result):
+        self._writer.writerow(result)
+        self.counts[result["status"]] += 1
+
+    def close(self):
+        self._handle.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def print_summary(self, *extra_lines):
+        elapsed = time.monotonic() - self.started
+        total = sum(self.counts.values())
+        print(f"\n\nAutomation complete in {elapsed:.0f}s "
+              f"({total / max(elapsed, 1e-9) * 60:.1f} vendors/min).")
+        for status, count in self.counts.most_common():
+            print(f"   {status}: {count}")
+        for line in extra_lines:
+            print(f"   {line}")
+        print(f"   Report written to '{self.path}'.")
@@ -0,0 +1,185 @@
+# Single-session runner behind Vendor_Upload.py, vendor2.py, vendor4.py and
+# rdashvendor.py, plus the per-vendor loop the parallel and API runners share.
+import argparse
+import time
+
+from . import flows, health, journal, pages, reader, recovery, report, scheduler, session, trace, waits
+from .config import DEBUGGER_ADDRESS, EXCEL_FILE_PATH
+
+
+def process(wizard, vendors, strategy, on_result, checkpoints=None, worker=0, claim=True, monitor=None,
+            on_attempt=None, bucket=None):
+    """Run `strategy` for each vendor, calling on_result(dict) for every one.
+
+    Failures are classified and recovered from (see recovery.py); transient ones that
+    happened before the vendor was submitted are retried with backoff once `vendors`
+    is exhausted, later ones are reported as "needs_check". With a health.HealthMonitor the
+    tab or session is recycled between vendors when it gets slow or bloated.
+    on_attempt(dict) gets the attempts queued for a retry, which on_result does not see
+    until their last attempt; each retry takes a token from `bucket`. Returns
+    False if the browser could not be recovered; the vendors not yet taken from
+    `vendors` are left in the iterator.
+    """
+    log = wizard.log
+    tracer = wizard.tracer
+    run = flows.FLOWS[strategy]
+    retries = recovery.RetryQueue()
+
+    def result(vendor, status, error="", seconds=0.0):
+        on_result(dict(vendor.as_dict(), worker=worker, status=status, error=error, seconds=seconds,
+                       steps=dict(wizard.step_times)))
+        if monitor and status != "skipped":
+            monitor.observe(seconds)
+        if checkpoints and status != "skipped":
+            checkpoints.finish(vendor.key, status, error)
+
+    def attempt(vendor, number):
+        """One go at `vendor`. Returns False if the session is beyond recovery."""
+        log(f"\n--- Processing Vendor: {vendor.name} ---" + (f" (attempt {number})" if number > 1 else ""))
+        started = time.monotonic()
+        wizard.step_times.clear()
+        wizard.submitted = False
+        if tracer:
+            tracer.begin_vendor(vendor)
+        try:
+            run(wizard, vendor)
+        except Exception as e:
+            error = str(e).strip()
+            failure = recovery.classify(e, wizard.driver)
+            log(f"   >>> ❌ ERROR processing '{vendor.name}' ({failure}). <<<")
+            log(f"   Reason: {error}")
+            with wizard.step("recover"):
+                tier = recovery.recover(wizard, strategy, failure)
+            seconds = time.monotonic() - started
+            if failure == recovery.DUPLICATE:
+                status = "duplicate"
+            elif failure in recovery.TRANSIENT and recovery.may_have_created(wizard):
+                # the vendor may exist already; another create could add it a second time
+                log("   > The vendor may already have been created. Not retrying; check it in RDash.")
+                status = "needs_check"
+                error = f"failed after submitting, vendor may exist: {error}"
+            elif failure in recovery.TRANSIENT and retries.offer(vendor, number):
+                log("   > Queued for another attempt at the end of the run.")
+                status = "retrying"
+            else:
+                log("   > Skipping to next vendor.")
+                status = "failed"
+            if tracer:
+                tracer.end_vendor(status, seconds)
+            # a vendor waiting for a retry stays in_flight in the journal until its
+            # last attempt is reported
+            if status != "retrying":
+                result(vendor, status, error, seconds)
+            elif on_attempt:
+                on_attempt(dict(vendor.as_dict(), worker=worker, status=status, error=error, seconds=seconds,
+                                steps=dict(wizard.step_times)))
+            return tier is not None
+        seconds = time.monotonic() - started
+        if tracer:
+            tracer.end_vendor("success", seconds)
+        result(vendor, "success", seconds=seconds)
+        log(f"--- ✅ SUCCESS: Vendor '{vendor.name}' added. Ready for next. ---")
+        return True
+
+    def abandon():
+        for vendor, _ in retries.drain_now():
+            result(vendor, "failed", "session could not recover")
+
+    def healthy():
+        # a failed recycle leaves the page in an unknown state; recover it like a lost session
+        if not monitor or monitor.check(wizard, strategy):
+            return True
+        return recovery.recover(wizard, strategy, recovery.SESSION_LOST) is not None
+
+    for vendor in vendors:
+        if claim and checkpoints and not checkpoints.claim(vendor, worker):
+            log(f"\n--- Skipping '{vendor.name}': already done or taken by another worker. ---")
+            result(vendor, "skipped")
+            continue
+        if not attempt(vendor, 1) or not healthy():
+            abandon()
+            return False
+
+    if retries:
+        log(f"\n--- Retrying {len(retries)} vendors that failed with transient errors ---")
+    for vendor, number in retries.drain():
+        if bucket:
+            bucket.acquire()
+        if not attempt(vendor, number + 1) or not healthy():
+            abandon()
+            return False
+    return True
+
+
+def main(strategy, description):
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument("--file", default=EXCEL_FILE_PATH)
+    parser.add_argument("--debugger-address", default=DEBUGGER_ADDRESS)
+    parser.add_argument("--report", default=report.REPORT_PATH)
+    parser.add_argument("--fast-fill", action="store_true",
+                        help="fill each wizard page with one injected script instead of send_keys")
+    parser.add_argument("--plan", action="store_true",
+                        help="instead of this script's fixed steps, run each row's shortest step plan")
+    journal.add_arguments(parser)
+    trace.add_arguments(parser)
+    health.add_arguments(parser)
+    scheduler.add_bucket_arguments(parser)
+    args = parser.parse_args()
+    if args.plan:
+        strategy = "plan"
+
+    #SETUP SELENIUM & ATTACH TO BROWSER
+    try:
+        driver = session.attach(args.debugger_address)
+        tracer = trace.Tracer(args.trace) if args.trace else None
+        wizard = pages.VendorWizard(driver, session.make_wait(driver), tracer=tracer, fast_fill=args.fast_fill,
+                                    reconnect=lambda: session.attach(args.debugger_address))
+        print("✅ Script Attached to Browser Successfully.")
+    except Exception as e:
+        print("❌ ERROR: Could not attach to Chrome.")
+        print("   Please ensure you have started Chrome in debugging mode using the command provided.")
+        print(f"   Error details: {e}")
+        return
+
+    #READ DATA FROM EXCEL
+    try:
+        vendors = reader.iter_vendors(args.file)
+        print(f"✅ Streaming vendors from '{args.file}'. Starting automation...")
+    except FileNotFoundError:
+        print(f"❌ ERROR: The file '{args.file}' was not found. Please make sure it's in the same folder.")
+        driver.quit()
+        return
+    if args.journal:
+        vendors = journal.prepare_run(args.journal, vendors, args.resume, args.retry_in_flight)
+    if strategy == "plan":
+        vendors = flows.group_by_plan(vendors)
+    bucket = scheduler.bucket_from_args(args)
+    if bucket:
+        vendors = scheduler.throttle(vendors, bucket)
+    checkpoints = journal.Journal(args.journal) if args.journal else None
+    health_options = health.options(args)
+    monitor = health.HealthMonitor(args.health_log, **health_options) if health_options else None
+
+    try:
+        print("\n--- Initializing Form ---")
+        flows.prepare(wizard, strategy)
+    except Exception:
+        print("❌ ERROR: Could not find the '+ Add New Vendor' button on the page.")
+        print("   Please make sure you are on the correct 'Manage Vendor' page before running the script.")
+        driver.quit()
+        return
+
+    with report.RunReport(args.report) as run_report:
+        if not process(wizard, vendors, strategy, run_report.add, checkpoints, monitor=monitor, bucket=bucket):
+            print("   > Stopping: the browser could not be brought back to the vendor form.")
+    if checkpoints:
+        checkpoints.close()
+    run_report.print_summary(waits.STATS.summary(), recovery.STATS.summary(),
+                             *([wizard.fast_fill_summary()] if args.fast_fill else []),
+                             *([monitor.summary()] if monitor else []))
+    if monitor:
+        monitor.close()
+    if tracer:
+        tracer.close()
+        trace.report(args, [args.trace])
+    wizard.driver.quit()
@@ -0,0 +1,132 @@
+# Adaptive scheduling in front of the submission loop. A token bucket caps how many
+# vendors are started per minute, and an AIMD controller sets how many browser
+# sessions are active. It adds a session after each healthy window and cuts the number
+# multiplicatively when the server slows down. The signal is the latency of the
+# 'Add & Continue' and submit steps, where the server does its work, together with
+# the share of attempts that failed, retried ones included. Every decision is printed
+# in the run log.
+import statistics
+import threading
+import time
+from collections import Counter
+
+from .config import AIMD_DECREASE, AIMD_WINDOW, MAX_CREATES_PER_MINUTE, MAX_ERROR_RATE, TARGET_SUBMIT_SECONDS
+
+# wizard steps (see flows.py) that wait on the server to save something
+SUBMIT_STEPS = ("add_continue", "basic_fast", "kyc_continue", "kyc_fast", "final_add", "save")
+
+
+class TokenBucket:
+    """At most `per_minute` acquisitions per minute, with bursts of up to `burst`.
+
+    With a multiprocessing context `ctx` the bucket's state lives in shared memory, so
+    the parent's feeder and the workers' retries draw from the same bucket.
+    """
+
+    def __init__(self, per_minute, burst=1, ctx=None):
+        self.rate = per_minute / 60.0
+        self.capacity = max(1, burst)
+        self.waited = 0.0  # seconds this process spent waiting for tokens
+        if ctx is None:
+            self._state = [float(self.capacity), time.monotonic()]
+            self._lock = threading.Lock()
+        else:
+            # time.monotonic() is system-wide, so the timestamp means the same in every process
+            self._state = ctx.Array("d", [float(self.capacity), time.monotonic()])
+            self._lock = None
+
+    def acquire(self):
+        started = time.monotonic()
+        while True:
+            with self._lock or self._state.get_lock():
+                tokens, updated = self._state[0], self._state[1]
+                now = time.monotonic()
+                tokens = min(self.capacity, tokens + (now - updated) * self.rate)
+                self._state[1] = now
+                if tokens >= 1:
+                    self._state[0] = tokens - 1
+                    self.waited += now - started
+                    return
+                self._state[0] = tokens
+                delay = (1 - tokens) / self.rate
+            time.sleep(delay)
+
+
+def throttle(vendors, bucket):
+    for vendor in vendors:
+        bucket.acquire()
+        yield vendor
+
+
+class AIMD:
+    """Number of active sessions, between `minimum` and `sessions`, from observed results."""
+
+    def __init__(self, sessions, initial=1, minimum=1, target=TARGET_SUBMIT_SECONDS,
+                 max_error_rate=MAX_ERROR_RATE, window=AIMD_WINDOW, decrease=AIMD_DECREASE, log=print):
+        self.sessions = sessions
+        self.minimum = minimum
+        self.active = max(minimum, min(initial, sessions))
+        self.target = target
+        self.max_error_rate = max_error_rate
+        self.window = window
+        self.decrease = decrease
+        self.log = log
+        self.decisions = Counter()
+        self.peak = self.active
+        self._latencies = []
+        self._count = self._errors = 0
+
+    def observe(self, result):
+        """Feed one vendor result; returns the new number of active sessions when it changes."""
+        if result["status"] == "skipped":
+            return None
+        self._count += 1
+        # attempts queued for a retry are errors too: they are what a cascade of timeouts looks like
+        self._errors += result["status"] in ("failed", "retrying", "needs_check")
+        self._latencies += [t for step, t in result.get("steps", {}).items() if step in SUBMIT_STEPS]
+        if self._count < self.window:
+            return None
+
+        latency = statistics.median(self._latencies) if self._latencies else None
+        error_rate = self._errors / self._count
+        before = self.active
+        if error_rate > self.max_error_rate or (latency is not None and latency > self.target):
+            self.active = max(self.minimum, int(self.active * self.decrease))
+            decision = "decrease"
+        elif self.active < self.sessions:
+            self.active += 1
+            decision = "increase"
+        else:
+            decision = "hold"
+        self.decisions[decision] += 1
+        self.peak = max(self.peak, self.active)
+        self.log(f"[scheduler] last {self._count} vendors: submit p50 "
+                 f"{f'{latency:.2f}s' if latency is not None else 'n/a'} (target {self.target:.2f}s), "
+                 f"errors {error_rate:.0%} (max {self.max_error_rate:.0%}) -> {decision}, "
+                 f"sessions {before} -> {self.active}")
+        self._latencies = []
+        self._count = self._errors = 0
+        return self.active if self.active != before else None
+
+    def summary(self):
+        return (f"Scheduler: {self.decisions['increase']} increases, {self.decisions['decrease']} decreases, "
+                f"{self.decisions['hold']} holds; peak {self.peak} and final {self.active} of {self.sessions} sessions.")
+
+
+def add_bucket_arguments(parser):
+    parser.add_argument("--max-per-minute", type=float, default=MAX_CREATES_PER_MINUTE,
+                        help="token bucket cap on vendors started per minute; 0 for no cap")
+
+
+def add_arguments(parser):
+    add_bucket_arguments(parser)
+    parser.add_argument("--adaptive", action="store_true",
+                        help="adjust the number of active sessions (AIMD) from submit latency and errors")
+    parser.add_argument("--initial-sessions", type=int, default=1, help="active sessions at the start with --adaptive")
+    parser.add_argument("--target-submit", type=float, default=TARGET_SUBMIT_SECONDS,
+                        help="submit step p50 in seconds above which --adaptive cuts sessions")
+    parser.add_argument("--max-error-rate", type=float, default=MAX_ERROR_RATE)
+
+
+def bucket_from_args(args, ctx=None):
+    return TokenBucket(args.max_per_minute, ctx=ctx) if args.max_per_minute else None
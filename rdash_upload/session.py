@@ -0,0 +1,125 @@
+import json
+import os
+import shutil
+import tempfile
+
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.chrome.service import Service
+from selenium.webdriver.support.ui import WebDriverWait
+
+from .config import BLOCKED_URLS, CHROME_BINARY, CHROME_DRIVER_PATH, WAIT_TIMEOUT
+
+# CookieParam fields Network.setCookies accepts; exports carry a few more (size, session)
+_COOKIE_FIELDS = ("name", "value", "url", "domain", "path", "secure", "httpOnly", "sameSite", "expires")
+
+# seeds localStorage for the origins in a state file, without overwriting what the
+# app has stored since (e.g. a refreshed token)
+_SEED_STORAGE_JS = """
+(function (origins) {
+  var items = origins[location.origin];
+  if (!items) return;
+  for (var i = 0; i < items.length; i++)
+    if (localStorage.getItem(items[i].name) === null) localStorage.setItem(items[i].name, items[i].value);
+})(%s);
+"""
+
+_LOCAL_STORAGE_JS = """
+var items = [];
+for (var i = 0; i < localStorage.length; i++) {
+  var name = localStorage.key(i);
+  items.push({name: name, value: localStorage.getItem(name)});
+}
+return {origin: location.origin, localStorage: items};
+"""
+
+
+class _HeadlessChrome(webdriver.Chrome):
+    """Chrome on a temporary profile directory, which is removed when it quits."""
+
+    def __init__(self, profile_dir, **kwargs):
+        self.profile_dir = profile_dir
+        super().__init__(**kwargs)
+
+    def quit(self):
+        try:
+            super().quit()
+        finally:
+            shutil.rmtree(self.profile_dir, ignore_errors=True)
+
+
+def attach(debugger_address, driver_path=CHROME_DRIVER_PATH):
+    """Attach to a Chrome started with --remote-debugging-port."""
+    chrome_options = Options()
+    chrome_options.add_experimental_option("debuggerAddress", debugger_address)
+    service = Service(executable_path=driver_path)
+    return webdriver.Chrome(service=service, options=chrome_options)
+
+
+def launch_headless(start_url=None, driver_path=CHROME_DRIVER_PATH, state=None, block=BLOCKED_URLS):
+    """Start a private headless Chrome with its own temporary profile directory, which
+    driver.quit() removes.
+
+    `state` is a storage state (see export_state) loaded before `start_url` opens, so
+    the session starts logged in; `block` is a list of URL patterns never fetched.
+    """
+    chrome_options = Options()
+    chrome_options.add_argument("--headless=new")
+    chrome_options.add_argument("--window-size=1600,1000")
+    profile_dir = tempfile.mkdtemp(prefix="rdash-")
+    chrome_options.add_argument(f"--user-data-dir={profile_dir}")
+    # containers give Chrome a tiny /dev/shm and often run as root
+    chrome_options.add_argument("--disable-dev-shm-usage")
+    if hasattr(os, "geteuid") and os.geteuid() == 0:
+        chrome_options.add_argument("--no-sandbox")
+    if CHROME_BINARY:
+        chrome_options.binary_location = CHROME_BINARY
+    service = Service(executable_path=driver_path)
+    try:
+        driver = _HeadlessChrome(profile_dir, service=service, options=chrome_options)
+    except Exception:
+        shutil.rmtree(profile_dir, ignore_errors=True)
+        raise
+    if block:
+        block_urls(driver, block)
+    if state:
+        load_state(driver, state)
+    if start_url:
+        driver.get(start_url)
+    return driver
+
+
+def block_urls(driver, patterns=BLOCKED_URLS):
+    driver.execute_cdp_cmd("Network.enable", {})
+    driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": list(patterns)})
+
+
+def export_state(driver):
+    """Cookies of every site plus localStorage of the current page's origin, in the
+    same shape as Playwright's storage_state files."""
+    cookies = driver.execute_cdp_cmd("Network.getAllCookies", {})["cookies"]
+    return {"cookies": cookies, "origins": [driver.execute_script(_LOCAL_STORAGE_JS)]}
+
+
+def load_state(driver, state):
+    cookies = []
+    for cookie in state.get("cookies", []):
+        cookie = {k: v for k, v in cookie.items() if k in _COOKIE_FIELDS}
+        if cookie.get("expires", 0) <= 0:
+            cookie.pop("expires", None)  # session cookie
+        cookies.append(cookie)
+    driver.execute_cdp_cmd("Network.enable", {})
+    driver.execute_cdp_cmd("Network.setCookies", {"cookies": cookies})
+    origins = {o["origin"]: o.get("localStorage", []) for o in state.get("origins", [])}
+    if origins:
+        driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument",
+                               {"source": _SEED_STORAGE_JS % json.dumps(origins)})
+
+
+def read_state(path):
+    with open(path, encoding="utf-8") as handle:
+        return json.load(handle)
+
+
+def make_wait(driver, timeout=WAIT_TIMEOUT):
+    return WebDriverWait(driver, timeout)
@@ -0,0 +1,114 @@
+# Local stand-in for the RDash vendor API that records every request it gets, for
+# trying out and load testing the API mode without touching the real tenant. It also
+# serves mock_wizard.html at / so the browser flows can run against it offline.
+#
+#   python -m rdash_upload.stub_server --port 8765 --latency 0.05
+import argparse
+import itertools
+import json
+import os
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from .config import API_KYC_PATH, API_VENDOR_PATH
+
+_KYC_RE = re.compile("^" + re.escape(API_KYC_PATH).replace(re.escape("{vendor_id}"), "(?P<vendor_id>[^/]+)") + "$")
+# any other per-vendor call the mock wizard makes, e.g. /api/vendors/7/tags
+_SUBRESOURCE_RE = re.compile("^" + re.escape(API_VENDOR_PATH) + r"/(?P<vendor_id>[^/]+)/\w+$")
+_MOCK_PAGE = os.path.join(os.path.dirname(__file__), "mock_wizard.html")
+
+
+def _mock_page():
+    with open(_MOCK_PAGE, encoding="utf-8") as handle:
+        page = handle.read()
+    return page.replace("{{VENDOR_PATH}}", API_VENDOR_PATH).replace("{{KYC_PATH}}", API_KYC_PATH).encode("utf-8")
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, so the client's connection pool is exercised
+
+    def do_GET(self):
+        if self.path.split("?")[0] not in ("/", "/index.html"):
+            return self._reply(404, {"message": "not found"})
+        data = _mock_page()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length)
+        try:
+            body = json.loads(raw or b"{}")
+        except ValueError:
+            body = None
+        server = self.server
+        with server.lock:
+            server.requests.append({"method": "POST", "path": self.path, "headers": dict(self.headers), "body": body})
+        if server.latency:
+            time.sleep(server.latency)
+
+        if self.path == API_VENDOR_PATH and isinstance(body, dict) and body.get("companyName"):
+            with server.lock:
+                if body["companyName"] in server.names:
+                    return self._reply(409, {"message": "Vendor already exists"})
+                server.names.add(body["companyName"])
+            return self._reply(201, {"data": {"id": next(server.ids)}})
+        if server.kyc_status and _KYC_RE.match(self.path):
+            return self._reply(server.kyc_status, {"message": "KYC service unavailable"})
+        match = _KYC_RE.match(self.path) or _SUBRESOURCE_RE.match(self.path)
+        if match and isinstance(body, dict):
+            return self._reply(200, {"data": {"id": match.group("vendor_id")}})
+        return self._reply(400, {"message": "bad request"})
+
+    def _reply(self, status, payload):
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+def serve(port=8765, latency=0.0, verbose=False, kyc_status=None):
+    """Start the stub in a background thread; `server.requests` holds what it received.
+    With `kyc_status` every KYC call is answered with that HTTP status."""
+    server = ThreadingHTTPServer(("127.0.0.1", port), _Handler)
+    server.daemon_threads = True
+    server.requests = []
+    server.names = set()
+    server.ids = itertools.count(1)
+    server.lock = threading.Lock()
+    server.latency = latency
+    server.kyc_status = kyc_status
+    server.verbose = verbose
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local stub of the RDash vendor API.")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every response")
+    parser.add_argument("--kyc-status", type=int, help="fail every KYC call with this HTTP status, e.g. 503")
+    args = parser.parse_args()
+    server = serve(args.port, args.latency, verbose=True, kyc_status=args.kyc_status)
+    print(f"✅ Stub RDash API listening on http://127.0.0.1:{args.port} (mock vendor page at /)")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        print(f"\n{len(server.requests)} requests recorded.")
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
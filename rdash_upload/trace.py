@@ -0,0 +1,183 @@
+# Per-vendor, per-step latency traces. Every wizard step becomes one JSONL line with
+# its duration and how much of it was spent waiting on the page (vs. acting on it);
+# every vendor gets a line with its total time and status. Each process writes its own
+# file, summarize() merges them into per-step p50/p95/max, vendors/minute and
+# wait-vs-act totals, optionally as a Prometheus textfile for node_exporter.
+#
+#   python -m rdash_upload.trace run_trace*.jsonl --prom /var/lib/node_exporter/rdash.prom
+import argparse
+import glob
+import json
+import os
+import time
+from collections import Counter, defaultdict
+
+TRACE_PATH = "run_trace.jsonl"
+
+
+class Span:
+    __slots__ = ("step", "start", "started", "wait")
+
+    def __init__(self, step):
+        self.step = step
+        self.start = time.time()
+        self.started = time.monotonic()
+        self.wait = 0.0
+
+
+class Tracer:
+    def __init__(self, path=TRACE_PATH, worker=0):
+        self.path = path
+        self.worker = worker
+        self.vendor = None
+        self.current = None
+        self._handle = open(path, "w", buffering=1, encoding="utf-8")  # line buffered
+
+    def _write(self, record):
+        self._handle.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+    def begin_vendor(self, vendor):
+        self.vendor = vendor
+
+    def end_vendor(self, status, seconds):
+        vendor = self.vendor
+        self._write({"type": "vendor", "worker": self.worker, "row": vendor.row, "key": vendor.key,
+                     "name": vendor.name, "status": status, "end": time.time(), "duration": seconds})
+        self.vendor = None
+
+    def open_span(self, step):
+        self.current = Span(step)
+        return self.current
+
+    def close_span(self, span, ok):
+        self.current = None
+        self._write({"type": "step", "worker": self.worker, "key": self.vendor.key if self.vendor else None,
+                     "step": span.step, "start": span.start, "duration": time.monotonic() - span.started,
+                     "wait": span.wait, "ok": ok})
+
+    def add_wait(self, seconds):
+        if self.current is not None:
+            self.current.wait += seconds
+
+    def close(self):
+        self._handle.close()
+
+
+def worker_path(path, worker):
+    base, extension = os.path.splitext(path)
+    return f"{base}.w{worker}{extension or '.jsonl'}"
+
+
+def _percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(q * (len(values) - 1))))]
+
+
+def summarize(paths):
+    steps = defaultdict(list)
+    wait = act = 0.0
+    statuses = Counter()
+    retried = 0
+    first = last = None
+    for path in paths:
+        with open(path, encoding="utf-8") as handle:
+            for line in handle:
+                record = json.loads(line)
+                if record["type"] == "step":
+                    steps[record["step"]].append(record["duration"])
+                    wait += record["wait"]
+                    act += record["duration"] - record["wait"]
+                elif record["status"] == "retrying":
+                    # an attempt that will be retried; the vendor is counted once, on its last attempt
+                    retried += 1
+                else:
+                    statuses[record["status"]] += 1
+                    start = record["end"] - record["duration"]
+                    first = start if first is None else min(first, start)
+                    last = record["end"] if last is None else max(last, record["end"])
+    vendors = sum(statuses.values())
+    elapsed = (last - first) if vendors else 0.0
+    return {
+        "steps": {step: {"count": len(v), "p50": _percentile(v, 0.5), "p95": _percentile(v, 0.95), "max": max(v)}
+                  for step, v in steps.items()},
+        "vendors": vendors,
+        "statuses": dict(statuses),
+        "retried_attempts": retried,
+        "vendors_per_minute": vendors / elapsed * 60 if elapsed > 0 else 0.0,
+        "wait_seconds": wait,
+        "act_seconds": act,
+    }
+
+
+def print_summary(summary):
+    print(f"\n{'step':<28}{'count':>7}{'p50 s':>9}{'p95 s':>9}{'max s':>9}")
+    for step, s in summary["steps"].items():
+        print(f"{step:<28}{s['count']:>7}{s['p50']:>9.2f}{s['p95']:>9.2f}{s['max']:>9.2f}")
+    total = summary["wait_seconds"] + summary["act_seconds"]
+    print(f"   {summary['vendors']} vendors, {summary['vendors_per_minute']:.1f} vendors/min"
+          + (f", {summary['retried_attempts']} attempts retried" if summary.get("retried_attempts") else ""))
+    if total:
+        print(f"   waiting {summary['wait_seconds']:.1f}s ({summary['wait_seconds'] / total:.0%}) "
+              f"vs acting {summary['act_seconds']:.1f}s ({summary['act_seconds'] / total:.0%})")
+
+
+def write_prometheus(summary, path):
+    lines = [
+        "# HELP rdash_step_seconds Wizard step latency.",
+        "# TYPE rdash_step_seconds gauge",
+    ]
+    for step, s in summary["steps"].items():
+        for quantile, key in (("0.5", "p50"), ("0.95", "p95"), ("1", "max")):
+            lines.append(f'rdash_step_seconds{{step="{step}",quantile="{quantile}"}} {s[key]:.6f}')
+    lines += [
+        "# HELP rdash_vendors_total Vendors processed in the last run, by status.",
+        "# TYPE rdash_vendors_total gauge",
+    ]
+    lines += [f'rdash_vendors_total{{status="{status}"}} {count}' for status, count in summary["statuses"].items()]
+    lines += [
+        "# HELP rdash_retried_attempts_total Attempts that failed transiently and were retried.",
+        "# TYPE rdash_retried_attempts_total gauge",
+        f"rdash_retried_attempts_total {summary.get('retried_attempts', 0)}",
+        "# HELP rdash_vendors_per_minute Throughput of the last run.",
+        "# TYPE rdash_vendors_per_minute gauge",
+        f"rdash_vendors_per_minute {summary['vendors_per_minute']:.6f}",
+        "# HELP rdash_time_seconds Time spent waiting on the page vs acting on it.",
+        "# TYPE rdash_time_seconds gauge",
+        f'rdash_time_seconds{{kind="wait"}} {summary["wait_seconds"]:.6f}',
+        f'rdash_time_seconds{{kind="act"}} {summary["act_seconds"]:.6f}',
+    ]
+    # write then rename so node_exporter never reads a half-written file
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as handle:
+        handle.write("\n".join(lines) + "\n")
+    os.replace(tmp, path)
+
+
+def add_arguments(parser):
+    parser.add_argument("--trace", default=TRACE_PATH,
+                        help="JSONL step trace (one file per worker); pass an empty string to disable")
+    parser.add_argument("--prom", help="write a Prometheus textfile with the run summary here")
+
+
+def report(args, paths):
+    """End-of-run summary for the runners."""
+    summary = summarize([p for p in paths if os.path.exists(p)])
+    print_summary(summary)
+    if args.prom:
+        write_prometheus(summary, args.prom)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Summarise JSONL step traces.")
+    parser.add_argument("traces", nargs="+", help="trace files (globs are expanded)")
+    parser.add_argument("--prom", help="also write a Prometheus textfile here")
+    args = parser.parse_args()
+    paths = [p for pattern in args.traces for p in (glob.glob(pattern) or [pattern])]
+    summary = summarize(paths)
+    print_summary(summary)
+    if args.prom:
+        write_prometheus(summary, args.prom)
+
+
+if __name__ == "__main__":
+    main()
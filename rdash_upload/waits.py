@@ -0,0 +1,141 @@
+# Adaptive waits that return as soon as the app signals it is done, instead of the
+# fixed time.sleep() calls the scripts used to make. Every wait is recorded against
+# the sleep it replaces so a run can report how much idle time was saved.
+import time
+
+from selenium.common.exceptions import WebDriverException
+
+from .config import WAIT_CEILING
+from .locators import ADD_NEW_VENDOR, BACKDROP, BANK_HEADER, OPEN_DROPDOWN, SUCCESS_TOAST
+
+# Counts in-flight XHR/fetch calls in the page. Survives SPA navigation, not a reload.
+_XHR_TRACKER_JS = """
+if (!window.__rdashNet) {
+  var net = window.__rdashNet = {pending: 0, started: 0, last: performance.now()};
+  var done = function () { net.pending = Math.max(0, net.pending - 1); net.last = performance.now(); };
+  var send = XMLHttpRequest.prototype.send;
+  XMLHttpRequest.prototype.send = function () {
+    net.pending++; net.started++; net.last = performance.now();
+    this.addEventListener('loadend', done);
+    return send.apply(this, arguments);
+  };
+  if (window.fetch) {
+    var fetch = window.fetch;
+    window.fetch = function () {
+      net.pending++; net.started++; net.last = performance.now();
+      return fetch.apply(this, arguments).finally(done);
+    };
+  }
+}
+"""
+
+
+class WaitStats:
+    def __init__(self):
+        self.waits = 0
+        self.timeouts = 0
+        self.legacy = 0.0
+        self.actual = 0.0
+
+    def record(self, legacy, actual, satisfied):
+        self.waits += 1
+        self.legacy += legacy
+        self.actual += actual
+        if not satisfied:
+            self.timeouts += 1
+
+    @property
+    def saved(self):
+        return self.legacy - self.actual
+
+    def as_dict(self):
+        return {"waits": self.waits, "timeouts": self.timeouts, "legacy": self.legacy, "actual": self.actual}
+
+    def merge(self, other):
+        self.waits += other["waits"]
+        self.timeouts += other["timeouts"]
+        self.legacy += other["legacy"]
+        self.actual += other["actual"]
+
+    def summary(self):
+        return (f"Adaptive waits: {self.waits} waits took {self.actual:.1f}s instead of "
+                f"{self.legacy:.1f}s of fixed sleeps ({self.saved:.1f}s saved, {self.timeouts} hit the ceiling).")
+
+
+STATS = WaitStats()
+
+
+def install_xhr_tracker(driver):
+    try:
+        driver.execute_script(_XHR_TRACKER_JS)
+    except WebDriverException:
+        pass
+
+
+def _displayed(driver, locator):
+    return any(el.is_displayed() for el in driver.find_elements(*locator))
+
+
+def toast_shown(driver):
+    return _displayed(driver, SUCCESS_TOAST)
+
+
+def bank_header_shown(driver):
+    return _displayed(driver, BANK_HEADER)
+
+
+def backdrop_gone(driver):
+    return not _displayed(driver, BACKDROP)
+
+
+def dropdown_closed(driver):
+    return not _displayed(driver, OPEN_DROPDOWN)
+
+
+def vendor_list_ready(driver):
+    if driver.execute_script("return document.readyState") != "complete":
+        return False
+    return any(el.is_displayed() and el.is_enabled() for el in driver.find_elements(*ADD_NEW_VENDOR))
+
+
+def network_settled(driver, quiet=0.25):
+    """Signal that fires once a request started after this call has finished and the
+    page has been quiet for `quiet` seconds. Create it *before* the click that submits."""
+    try:
+        baseline = driver.execute_script("return window.__rdashNet ? window.__rdashNet.started : null")
+    except WebDriverException:
+        baseline = None
+
+    def settled(driver):
+        if baseline is None:
+            return False
+        net = driver.execute_script("return window.__rdashNet ? [window.__rdashNet.pending, "
+                                    "window.__rdashNet.started, performance.now() - window.__rdashNet.last] : null")
+        return bool(net) and net[1] > baseline and net[0] == 0 and net[2] >= quiet * 1000
+
+    return settled
+
+
+def settle(driver, *signals, legacy, ceiling=WAIT_CEILING, poll=0.05, stats=None):
+    """Wait until any of `signals` is true, for at most `ceiling` seconds.
+
+    `legacy` is the fixed sleep this wait replaces and is only used for reporting.
+    Returns True if a signal fired, False if the ceiling was reached.
+    """
+    started = time.monotonic()
+    deadline = started + ceiling
+    satisfied = False
+    while not satisfied:
+        for signal in signals:
+            try:
+                if signal(driver):
+                    satisfied = True
+                    break
+            except WebDriverException:
+                # element went stale mid-check or the page is reloading; keep polling
+                pass
+        if satisfied or time.monotonic() >= deadline:
+            break
+        time.sleep(poll)
+    (stats or STATS).record(legacy, time.monotonic() - started, satisfied)
+    return satisfied
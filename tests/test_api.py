@@ -0,0 +1,63 @@
+import asyncio
+
+import pytest
+
+from rdash_upload import api, stub_server
+from rdash_upload.config import API_KYC_PATH, API_VENDOR_PATH, RETRY_ATTEMPTS
+from rdash_upload.reader import Vendor
+
+
+@pytest.fixture
+def server():
+    server = stub_server.serve(port=0)
+    yield server
+    server.shutdown()
+
+
+def _submit(server, vendors):
+    results = {}
+
+    def on_result(vendor, error, seconds):
+        results[vendor.row] = error
+
+    session = api.ApiSession(f"http://127.0.0.1:{server.server_address[1]}", token="test")
+    asyncio.run(api.submit_all(vendors, session, on_result, concurrency=1))
+    return results
+
+
+def _posts(server):
+    return [(request["path"], request["body"]) for request in server.requests]
+
+
+def test_creates_vendors_and_sends_their_trn(server):
+    results = _submit(server, [Vendor(2, "Acme Trading", "100200300400500"), Vendor(3, "Beta LLC")])
+    assert results == {2: None, 3: None}
+    assert _posts(server) == [
+        (API_VENDOR_PATH, {"companyName": "Acme Trading", "hasTradeLicense": False}),
+        (API_KYC_PATH.format(vendor_id=1), {"TRN": "100200300400500"}),
+        (API_VENDOR_PATH, {"companyName": "Beta LLC", "hasTradeLicense": False}),
+    ]
+    assert server.requests[0]["headers"]["Authorization"] == "Bearer test"
+
+
+def test_existing_vendor_is_a_duplicate(server):
+    results = _submit(server, [Vendor(2, "Acme Trading", "100200300400500"), Vendor(3, "Acme Trading")])
+    assert results[2] is None
+    assert isinstance(results[3], api.ApiError) and results[3].duplicate
+    assert [path for path, _ in _posts(server)].count(API_VENDOR_PATH) == 2
+
+
+def test_failed_kyc_call_is_retried_but_never_the_create(server, monkeypatch):
+    monkeypatch.setattr(api, "RETRY_BASE_DELAY", 0)
+    server.kyc_status = 503
+    results = _submit(server, [Vendor(2, "Acme Trading", "100200300400500")])
+    assert isinstance(results[2], api.KycError) and results[2].vendor_id == 1
+    paths = [path for path, _ in _posts(server)]
+    assert paths == [API_VENDOR_PATH] + [API_KYC_PATH.format(vendor_id=1)] * RETRY_ATTEMPTS
+
+
+def test_rejected_kyc_call_is_not_retried(server):
+    server.kyc_status = 422
+    results = _submit(server, [Vendor(2, "Acme Trading", "100200300400500")])
+    assert isinstance(results[2], api.KycError)
+    assert len(server.requests) == 2
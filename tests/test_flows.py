@@ -0,0 +1,23 @@
+from rdash_upload import flows
+from rdash_upload.reader import Vendor
+
+
+def test_plan_walks_only_as_far_as_the_last_value():
+    assert flows.plan(Vendor(2, "Acme")) == ("open_form", "basic", "kyc_page", "close")
+    assert flows.plan(Vendor(2, "Acme", "100200300400500")) == (
+        "open_form", "basic", "kyc_page", "trn", "bank_page", "close")
+    assert flows.plan(Vendor(2, "Acme", None, "Civil")) == (
+        "open_form", "basic", "kyc_page", "kyc_skip", "bank_page", "skip_bank", "skip_other", "skip_user",
+        "tag", "final_add")
+    assert flows.plan(Vendor(2, "Acme", "100200300400500", "Civil"))[3] == "trn"
+
+
+def test_every_planned_step_exists():
+    for vendor in (Vendor(2, "Acme"), Vendor(2, "Acme", "1"), Vendor(2, "Acme", None, "Civil")):
+        assert all(step in flows.STEPS for step in flows.plan(vendor))
+
+
+def test_group_by_plan_keeps_order_within_groups_and_windows():
+    vendors = [Vendor(2, "A"), Vendor(3, "B", "1"), Vendor(4, "C"), Vendor(5, "D", "2"), Vendor(6, "E")]
+    assert [v.row for v in flows.group_by_plan(vendors, window=4)] == [2, 4, 3, 5, 6]
+    assert [v.row for v in flows.group_by_plan(vendors)] == [2, 4, 6, 3, 5]
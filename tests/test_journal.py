@@ -0,0 +1,30 @@
+from rdash_upload import journal
+from rdash_upload.reader import Vendor
+
+
+def test_claim_gives_a_row_to_one_connection_only(tmp_path):
+    path = str(tmp_path / "journal.sqlite")
+    first, second = journal.Journal(path), journal.Journal(path)
+    vendor = Vendor(2, "Acme Trading", "100200300400500")
+    assert first.claim(vendor, 0)
+    assert not second.claim(vendor, 1)
+    first.finish(vendor.key, "failed", "timed out")
+    assert second.claim(vendor, 1)
+    second.finish(vendor.key, "success")
+    assert not first.claim(vendor, 0)
+    assert first.counts() == {journal.SUCCEEDED: 1}
+    first.close()
+    second.close()
+
+
+def test_needs_check_is_never_claimed_or_resumed(tmp_path):
+    path = str(tmp_path / "journal.sqlite")
+    checkpoints = journal.Journal(path)
+    checked, failed = Vendor(2, "Acme Trading"), Vendor(3, "Beta LLC")
+    for vendor, status in ((checked, "needs_check"), (failed, "failed")):
+        checkpoints.claim(vendor, 0)
+        checkpoints.finish(vendor.key, status)
+    assert not checkpoints.claim(checked, 1)
+    checkpoints.close()
+    assert [v.row for v in journal.prepare_run(path, [checked, failed], resume=True)] == [3]
+    assert [v.row for v in journal.prepare_run(path, [checked, failed], resume=True, retry_in_flight=True)] == [2, 3]
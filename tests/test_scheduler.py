@@ -0,0 +1,37 @@
+import time
+
+from rdash_upload import scheduler
+
+
+def test_token_bucket_spaces_acquisitions():
+    bucket = scheduler.TokenBucket(per_minute=6000)
+    started = time.monotonic()
+    for _ in range(6):
+        bucket.acquire()
+    # the first token is there from the start, the other five come 10 ms apart
+    assert time.monotonic() - started >= 0.045
+    assert bucket.waited >= 0.045
+
+
+def _result(status="success", seconds=1.0):
+    return {"status": status, "steps": {"add_continue": seconds, "open_form": 30.0}}
+
+
+def test_aimd_increases_while_healthy_and_stops_at_the_pool_size():
+    controller = scheduler.AIMD(3, initial=1, target=2.0, window=2, log=lambda msg: None)
+    changes = [controller.observe(_result()) for _ in range(6)]
+    assert changes == [None, 2, None, 3, None, None]
+    assert controller.decisions == {"increase": 2, "hold": 1}
+
+
+def test_aimd_decreases_on_slow_submits_and_on_errors():
+    controller = scheduler.AIMD(8, initial=8, target=2.0, max_error_rate=0.25, window=2, decrease=0.5,
+                                log=lambda msg: None)
+    controller.observe(_result(seconds=5.0))
+    assert controller.observe(_result(seconds=5.0)) == 4
+    controller.observe(_result("retrying"))
+    assert controller.observe(_result()) == 2
+    controller.observe(_result("skipped"))
+    controller.observe(_result("needs_check"))
+    assert controller.observe(_result()) == 1
+    assert controller.observe(_result()) is None